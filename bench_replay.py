@@ -0,0 +1,261 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+# Benchmarks must be repeatable: no cache, no resume state, no archive writes from the runs
+# themselves. Only the benchmark's own process gets these (the scraper modules read them on
+# import, hence before the imports below); importing this module changes nothing.
+if __name__ == "__main__":
+    os.environ.setdefault("SCRAPER_HTTP_CACHE", "0")
+    os.environ.setdefault("SCRAPER_CHECKPOINTS", "0")
+    os.environ.setdefault("SCRAPER_STATE_DIR", tempfile.mkdtemp(prefix="scrape_bench_"))
+
+import http_client  # noqa: E402
+import response_archive  # noqa: E402
+import scrape_engine  # noqa: E402
+import vendor_scraper  # noqa: E402
+from vendor_specs import SPECS  # noqa: E402
+
+PAGE_RE = re.compile(r"[?&](?:p|page)=(\d+)|/page/(\d+)/?")
+
+# Served for any non-listing path in seed mode, so microless stock checks have something to parse
+PRODUCT_TEMPLATE = b"""<html><body>
+<div class="product-price"><span class="price-amount">999</span></div>
+<div class="bottom"><div class="instock-lable">In Stock</div></div>
+<div class="quantity-selector"><select name="quantity"><option>1</option><option>2</option><option>3</option></select></div>
+</body></html>"""
+
+
+def page_number(path):
+    match = PAGE_RE.search(path)
+    if not match:
+        return 1
+    return int(match.group(1) or match.group(2))
+
+
+class ReplayServer:
+    # Serves recorded pages on 127.0.0.1 with injected latency, jitter and 429s. In seed mode
+    # `listings` maps each category path served to the listing HTML repeated for its pages.
+    def __init__(self, pages=None, listings=None, max_pages=1,
+                 latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        self.pages = pages or {}
+        self.listings = listings or {}
+        self.max_pages = max_pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.injected = 0
+        self.server = None
+
+    def body_for(self, path):
+        if path in self.pages:
+            return self.pages[path]
+        if not self.listings:
+            return None
+        # The longest match wins, for categories nested under another vendor's path
+        matches = [p for p in self.listings if path.startswith(p)]
+        if matches:
+            template = self.listings[max(matches, key=len)]
+            return template if page_number(path) <= self.max_pages else None
+        return PRODUCT_TEMPLATE
+
+    def start(self):
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with owner.lock:
+                    owner.requests += 1
+                    inject = owner.random.random() < owner.error_rate
+                    delay = max(0.0, owner.latency + owner.random.uniform(-owner.jitter, owner.jitter))
+                    if inject:
+                        owner.injected += 1
+
+                time.sleep(delay)
+                if inject:
+                    self.send_response(429)
+                    self.send_header("Retry-After", "1")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                body = owner.body_for(self.path)
+                self.send_response(200 if body is not None else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body or b"")))
+                self.end_headers()
+                self.wfile.write(body or b"")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def archive_pages(day):
+    # {original host: {path?query: body}} for every 200 response archived that day
+    response_archive.start_replay(day)
+    by_host = {}
+    try:
+        for url in list(response_archive._replay_index):
+            response = response_archive.replay_response(url)
+            if response.status_code != 200:
+                continue
+            parts = urlsplit(url)
+            path = parts.path + (f"?{parts.query}" if parts.query else "")
+            by_host.setdefault(parts.netloc, {})[path] = response.content
+    finally:
+        response_archive.stop_replay()
+    return by_host
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return usage / 1024 / 1024 if sys.platform == "darwin" else usage / 1024
+
+
+def run_benchmark(vendors, servers, use_orchestrator=False):
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def observe(url, status, latency, size, waited):
+        with lock:
+            latencies.append(latency)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    export_dir = Path(tempfile.mkdtemp(prefix="scrape_bench_out_"))
+    http_client.add_observer(observe)
+    start = time.perf_counter()
+    try:
+        if use_orchestrator:
+            vendor_scraper.run_all_scrapers(vendors, export_dir)
+            products = sum(
+                max(0, sum(1 for _ in open(f, encoding="utf-8")) - 1) for f in export_dir.glob("*.csv")
+            )
+        else:
+            products = 0
+            for name in vendors:
+                products += scrape_engine.scrape_vendor(name, export_dir) or 0
+    finally:
+        http_client.remove_observer(observe)
+    wall = time.perf_counter() - start
+
+    served = sum(s.requests for s in servers)
+    return {
+        "vendors": vendors,
+        "wall_seconds": round(wall, 3),
+        "requests": served,
+        "pages_per_second": round(served / wall, 2) if wall else 0.0,
+        "products": products,
+        "products_per_second": round(products / wall, 2) if wall else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "statuses": statuses,
+        "injected_429": sum(s.injected for s in servers),
+        "peak_rss_mb": round(peak_rss_mb() or 0.0, 1),
+    }
+
+
+def print_report(result):
+    print("\n📊 Benchmark result")
+    print(f"  vendors        {', '.join(result['vendors'])}")
+    print(f"  wall time      {result['wall_seconds']:.2f}s")
+    print(f"  requests       {result['requests']} ({result['pages_per_second']:.1f}/s)")
+    print(f"  products       {result['products']} ({result['products_per_second']:.1f}/s)")
+    print(f"  latency        p50 {result['latency_p50_ms']:.1f} ms  p99 {result['latency_p99_ms']:.1f} ms")
+    print(f"  statuses       {result['statuses']}  injected 429s: {result['injected_429']}")
+    print(f"  peak RSS       {result['peak_rss_mb']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scrapers against a local replay server")
+    parser.add_argument("vendors", nargs="*", help="vendor spec names (default: every vendor in the archive, or gccgamers_gpu)")
+    parser.add_argument("--seed", type=Path, help="saved listing HTML served for every listing page (e.g. selenium_page.html)")
+    parser.add_argument("--archive-day", help="serve the pages archived on this day instead of a seed file")
+    parser.add_argument("--pages", type=int, default=10, help="listing pages per vendor in seed mode")
+    parser.add_argument("--latency", type=float, default=0.05, help="base server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="+/- random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--all", action="store_true", help="go through vendor_scraper.run_all_scrapers")
+    parser.add_argument("--json", type=Path, help="also write the result to this file")
+    args = parser.parse_args()
+
+    knobs = dict(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.random_seed)
+    servers = {}
+
+    if args.archive_day:
+        recorded = archive_pages(args.archive_day)
+        vendors = args.vendors or [
+            name for name, spec in SPECS.items() if http_client.host_of(spec["base_url"]) in recorded
+        ]
+        if not vendors:
+            print(f"⚠️ Nothing archived on {args.archive_day} belongs to a known vendor host: {', '.join(recorded)}")
+            return
+        for name in vendors:
+            host = http_client.host_of(SPECS[name]["base_url"])
+            if host not in servers:
+                servers[host] = ReplayServer(pages=recorded.get(host, {}), **knobs)
+    else:
+        vendors = args.vendors or ["gccgamers_gpu"]
+        template = (args.seed or Path("selenium_page.html")).read_bytes()
+        # Vendors sharing a host share its server, which serves every one of their categories
+        for name in vendors:
+            host = http_client.host_of(SPECS[name]["base_url"])
+            if host not in servers:
+                servers[host] = ReplayServer(max_pages=args.pages, **knobs)
+            servers[host].listings[SPECS[name]["category_path"]] = template
+
+    # Point every vendor at its local stand-in; vendors that shared a host still share one server
+    urls = {host: server.start() for host, server in servers.items()}
+    for name in vendors:
+        SPECS[name]["base_url"] = urls[http_client.host_of(SPECS[name]["base_url"])]
+
+    try:
+        result = run_benchmark(vendors, list(servers.values()), use_orchestrator=args.all)
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    print_report(result)
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
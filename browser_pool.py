@@ -0,0 +1,137 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+try:
+    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+except ImportError:
+    sync_playwright = None
+    PlaywrightTimeout = TimeoutError
+
+# Browsers kept warm at once; each one serves a page at a time
+BROWSER_WORKERS = int(os.environ.get("SCRAPER_BROWSER_WORKERS", "2"))
+
+# Seconds any page load or wait may take unless a call passes its own timeout
+NAVIGATION_TIMEOUT = float(os.environ.get("SCRAPER_BROWSER_NAV_TIMEOUT", "30"))
+
+# Set to "0" to watch the browsers (some challenges only pass in a visible window)
+HEADLESS = os.environ.get("SCRAPER_BROWSER_HEADLESS", "1") != "0"
+
+# Requests a scraper never needs: they only cost bandwidth and time
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_URL_PARTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net",
+    "hotjar.com", "clarity.ms", "analytics", "/pixel",
+]
+
+_STOP = object()
+
+
+def _blocked(request):
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    url = request.url.lower()
+    return any(part in url for part in BLOCKED_URL_PARTS)
+
+
+class BrowserPool:
+    # Worker threads that each own one launched browser and one warm context with
+    # resource blocking; a job gets a fresh page in that context. Playwright's sync
+    # API is bound to the thread that started it, so every call happens on the worker.
+    def __init__(self, workers=BROWSER_WORKERS, engine="chromium", device=None, headless=HEADLESS,
+                 context_options=None, block=True):
+        if sync_playwright is None:
+            raise RuntimeError("Playwright is not installed (pip install playwright && playwright install)")
+
+        self.engine = engine
+        self.device = device
+        self.headless = headless
+        self.context_options = context_options or {}
+        self.block = block
+        self.jobs = queue.Queue()
+        self.threads = []
+        ready = []
+
+        for i in range(max(1, workers)):
+            started = Future()
+            thread = threading.Thread(target=self._worker, args=(started,), name=f"browser-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+            ready.append(started)
+
+        # Surface launch errors here instead of on the first job
+        for started in ready:
+            started.result()
+        print(f"🌐 {len(self.threads)} warm {engine} browser(s) ready{' (headless)' if headless else ''}")
+
+    def _worker(self, started):
+        try:
+            playwright = sync_playwright().start()
+            browser = getattr(playwright, self.engine).launch(headless=self.headless)
+            options = dict(playwright.devices[self.device]) if self.device else {}
+            options.update(self.context_options)
+            context = browser.new_context(**options)
+            context.set_default_navigation_timeout(NAVIGATION_TIMEOUT * 1000)
+            context.set_default_timeout(NAVIGATION_TIMEOUT * 1000)
+            if self.block:
+                context.route("**/*", lambda route: route.abort() if _blocked(route.request) else route.continue_())
+        except Exception as e:
+            started.set_exception(e)
+            return
+        started.set_result(True)
+
+        try:
+            while True:
+                item = self.jobs.get()
+                if item is _STOP:
+                    break
+                job, target, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                page = context.new_page()
+                try:
+                    future.set_result(job(page, target))
+                except Exception as e:
+                    future.set_exception(e)
+                finally:
+                    page.close()
+        finally:
+            browser.close()
+            playwright.stop()
+
+    def submit(self, job, target):
+        # job(page, target) runs on a warm browser; returns a Future with its result
+        future = Future()
+        self.jobs.put((job, target, future))
+        return future
+
+    def map(self, job, targets):
+        # Runs every target in parallel pages and returns results in target order
+        futures = [self.submit(job, target) for target in targets]
+        return [future.result() for future in futures]
+
+    def close(self):
+        for _ in self.threads:
+            self.jobs.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def wait_for_more(page, selector, count, timeout_ms):
+    # Waits until more than count elements match selector; False when nothing new shows up
+    try:
+        page.wait_for_function(
+            "([sel, n]) => document.querySelectorAll(sel).length > n", arg=[selector, count], timeout=timeout_ms
+        )
+        return True
+    except PlaywrightTimeout:
+        return False
@@ -0,0 +1,54 @@
+import os
+import json
+from pathlib import Path
+
+import browser_pool
+
+# Seconds the browser gets to clear the site's challenge and show the listing
+CHALLENGE_TIMEOUT = float(os.environ.get("SCRAPER_BROWSER_TIMEOUT", "45"))
+
+
+def load_cookies(path):
+    # Browser-style cookie list as saved by extract_citycenter_cookies.py or save_cookies()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_cookies(path, cookies):
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cookies, f, indent=2)
+    os.replace(tmp, path)
+
+
+def harvest_cookies(url, user_agent, ready_selector, timeout=CHALLENGE_TIMEOUT, proxy=None):
+    # Opens url once in a pooled browser, waits for ready_selector past any challenge
+    # page and returns the context's cookies. The user agent (and proxy, for a host
+    # pinned to one) must match later requests, since clearance cookies are tied to them.
+    if browser_pool.sync_playwright is None:
+        raise RuntimeError(
+            "stored cookies were rejected and Playwright is not installed; "
+            "run extract_citycenter_cookies.py to refresh them by hand"
+        )
+
+    def clear_challenge(page, url):
+        page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+        try:
+            page.wait_for_selector(ready_selector, timeout=timeout * 1000)
+        except browser_pool.PlaywrightTimeout:
+            raise RuntimeError(f"browser did not get past the challenge on {url} in {timeout:.0f}s")
+        return page.context.cookies()
+
+    print(f"🌐 Launching browser for {url}")
+    context_options = {"user_agent": user_agent}
+    if proxy:
+        context_options["proxy"] = proxy
+    with browser_pool.BrowserPool(workers=1, context_options=context_options) as pool:
+        cookies = pool.submit(clear_challenge, url).result()
+
+    print(f"🍪 Collected {len(cookies)} cookies from the browser")
+    return cookies
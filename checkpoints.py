@@ -0,0 +1,92 @@
+import os
+import copy
+import json
+import threading
+from datetime import date
+
+from fingerprints import STATE_DIR
+
+CHECKPOINT_DIR = STATE_DIR / "checkpoints"
+
+# Set to "0" to always start from page 1
+ENABLED = os.environ.get("SCRAPER_CHECKPOINTS", "1") != "0"
+
+
+class Checkpoint:
+    # Append-only JSON Lines log of finished pages and resolved product URLs for today's run.
+    # A rerun on the same day replays it and only fetches what is missing.
+    def __init__(self, vendor, enabled=ENABLED):
+        self.vendor = vendor
+        self.enabled = enabled
+        self.path = CHECKPOINT_DIR / f"{vendor}.jsonl"
+        self.lock = threading.Lock()
+        self.pagination = {}
+        self.pages = {}
+        self.resolved = {}
+
+        if enabled:
+            self._load()
+
+    def _load(self):
+        today = date.today().isoformat()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # A crash mid-write can leave a torn last line
+                continue
+
+        if not records or records[0].get("date") != today:
+            self.clear()
+            return
+
+        for record in records[1:]:
+            if "pagination" in record:
+                self.pagination = record["pagination"]
+            elif "page" in record:
+                self.pages[record["page"]] = record["rows"]
+            elif "url" in record:
+                self.resolved[record["url"]] = (record["stock"], record["qty"])
+
+        if self.pages:
+            print(f"⏯ {self.vendor}: resuming with {len(self.pages)} pages and {len(self.resolved)} stock checks already done")
+
+    def _append(self, record):
+        if not self.enabled:
+            return
+        with self.lock:
+            new_file = not self.path.exists()
+            CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                if new_file:
+                    f.write(json.dumps({"date": date.today().isoformat()}) + "\n")
+                f.write(json.dumps(record) + "\n")
+
+    def save_pagination(self, state):
+        # A deep copy: the caller keeps filling the nested page sizes in after this call
+        if state != self.pagination:
+            self.pagination = copy.deepcopy(state)
+            self._append({"pagination": self.pagination})
+
+    def page_done(self, page, rows):
+        # Only the log keeps the rows; self.pages is what was loaded for resuming
+        self._append({"page": page, "rows": rows})
+
+    def resolve(self, url, result):
+        self.resolved[url] = tuple(result)
+        self._append({"url": url, "stock": result[0], "qty": result[1]})
+
+    def clear(self):
+        if not self.enabled:
+            return
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,78 @@
+import os
+import time
+import threading
+
+# Seconds each level of a scrape may take. Every level is also cut short by the one
+# above it: a run bounds its vendors, a vendor its pages, a page its requests.
+RUN_SECONDS = float(os.environ.get("SCRAPER_RUN_DEADLINE", "10800"))
+VENDOR_SECONDS = float(os.environ.get("SCRAPER_VENDOR_DEADLINE", "2700"))
+PAGE_SECONDS = float(os.environ.get("SCRAPER_PAGE_DEADLINE", "120"))
+REQUEST_SECONDS = float(os.environ.get("SCRAPER_REQUEST_DEADLINE", "45"))
+
+# Below this, starting new work is pointless; it is skipped and reported instead
+MIN_USEFUL_SECONDS = 1.0
+
+_run = None
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class Deadline:
+    # A point on the monotonic clock that is never later than its parent's. `label` names
+    # whichever level actually set the end, so errors say what ran out.
+    def __init__(self, seconds=None, parent=None, label=""):
+        self.end = time.monotonic() + seconds if seconds else float("inf")
+        self.label = label
+        if parent is not None and parent.end <= self.end:
+            self.end = parent.end
+            self.label = parent.label
+        self.parent = parent
+        self.lock = threading.Lock()
+        self.skipped = 0
+
+    def child(self, seconds, label):
+        return Deadline(seconds, self, label)
+
+    def remaining(self):
+        return self.end - time.monotonic()
+
+    def expired(self):
+        return self.remaining() < MIN_USEFUL_SECONDS
+
+    def check(self, what="", margin=MIN_USEFUL_SECONDS):
+        # margin 0 is for work already under way, which may use every last second
+        if self.remaining() < margin:
+            raise DeadlineExceeded(f"{self.label} deadline reached{' before ' + what if what else ''}")
+
+    def skip(self):
+        # Counts work dropped because this deadline (or one above it) ran out
+        with self.lock:
+            self.skipped += 1
+        if self.parent is not None:
+            self.parent.skip()
+
+    def timeout(self, timeout):
+        # Shrinks a requests timeout, a number or a (connect, read) pair, to the time left
+        left = max(0.1, self.remaining())
+        if isinstance(timeout, tuple):
+            return tuple(min(t, left) for t in timeout)
+        return min(timeout, left) if timeout else left
+
+
+def start_run(seconds=RUN_SECONDS):
+    global _run
+    _run = Deadline(seconds, label="run")
+    return _run
+
+
+def finish_run():
+    global _run
+    run, _run = _run, None
+    return run
+
+
+def for_vendor(seconds=VENDOR_SECONDS):
+    # A vendor scraped outside an orchestrated run only has its own budget
+    return Deadline(seconds, _run, "vendor")
@@ -0,0 +1,80 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+STATE_DIR = Path(os.environ.get("SCRAPER_STATE_DIR", ".scrape_state"))
+FINGERPRINT_DIR = STATE_DIR / "fingerprints"
+
+# A carried-forward stock result older than this is refreshed even if the card is unchanged
+MAX_AGE_HOURS = float(os.environ.get("SCRAPER_FINGERPRINT_MAX_AGE_HOURS", "72"))
+
+# Columns filled from the product page (or stamped per run) never go into the card hash
+DETAIL_COLUMNS = ("Date", "Stock Status", "Available Qty")
+
+
+def card_hash(row):
+    card = {k: str(v) for k, v in row.items() if k not in DETAIL_COLUMNS}
+    return hashlib.sha1(json.dumps(card, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class FingerprintIndex:
+    def __init__(self, vendor, max_age_hours=MAX_AGE_HOURS, enabled=True):
+        self.vendor = vendor
+        self.enabled = enabled
+        self.path = FINGERPRINT_DIR / f"{vendor}.json"
+        self.max_age = timedelta(hours=max_age_hours)
+        self.previous = {}
+        self.current = {}
+        self.carried = 0
+
+        if not enabled:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.previous = json.load(f)
+        except (OSError, ValueError):
+            self.previous = {}
+
+    def carry_forward(self, row):
+        # Fills the row from the last run and returns True when its card is unchanged and fresh
+        url = row.get("Product URL", "")
+        entry = self.previous.get(url)
+        if not entry or entry.get("hash") != card_hash(row):
+            return False
+
+        try:
+            checked_at = datetime.fromisoformat(entry["checked_at"])
+        except (KeyError, ValueError):
+            return False
+        if datetime.now() - checked_at > self.max_age:
+            return False
+
+        row["Stock Status"] = entry.get("stock", "")
+        row["Available Qty"] = entry.get("qty", "")
+        self.current[url] = entry
+        self.carried += 1
+        return True
+
+    def record(self, row):
+        url = row.get("Product URL", "")
+        if url and url not in self.current:
+            self.current[url] = {
+                "hash": card_hash(row),
+                "stock": row.get("Stock Status", ""),
+                "qty": row.get("Available Qty", ""),
+                "checked_at": datetime.now().isoformat(timespec="seconds"),
+            }
+
+    def save(self):
+        if not self.enabled:
+            return
+        FINGERPRINT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.current, f, indent=1)
+        os.replace(tmp, self.path)
+
+        if self.carried:
+            print(f"♻️ {self.vendor}: carried stock forward for {self.carried} unchanged products")
@@ -0,0 +1,73 @@
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_BACKEND = "lxml"
+except ImportError:
+    DEFAULT_BACKEND = "html.parser"
+
+# BeautifulSoup tree builder used for every vendor page ("lxml" or "html.parser")
+PARSER_BACKEND = os.environ.get("SCRAPER_PARSER", DEFAULT_BACKEND)
+
+# Parse every listing twice (full html.parser tree vs. scoped backend) and report differences
+COMPARE_BACKENDS = os.environ.get("SCRAPER_PARSER_COMPARE", "0") == "1"
+
+# Tags that can carry a kept class; anything else is skipped by the tokenizer
+SCOPED_TAGS = ["div", "p", "ul", "li", "a", "nav", "span", "select"]
+
+
+def strainer(keep_classes):
+    # Matched as whole class tokens against the raw attribute, which is what parse_only sees
+    pattern = re.compile(r"(?:^|\s)(?:%s)(?:\s|$)" % "|".join(re.escape(c) for c in keep_classes))
+    return SoupStrainer(SCOPED_TAGS, class_=pattern)
+
+
+def make_soup(content, keep_classes=None, backend=None):
+    # keep_classes limits the tree to elements carrying one of those classes (and their children)
+    backend = backend or PARSER_BACKEND
+    if not keep_classes:
+        return BeautifulSoup(content, backend)
+    return BeautifulSoup(content, backend, parse_only=strainer(keep_classes))
+
+
+def _timed(content, keep_classes, backend, select_items, parse_item):
+    start = time.perf_counter()
+    soup = make_soup(content, keep_classes, backend)
+    items = select_items(soup)
+    rows = [parse_item(item) for item in items]
+    return rows, time.perf_counter() - start
+
+
+def _text(item):
+    return item.get_text(" ", strip=True)
+
+
+def compare_backends(content, keep_classes, select_items, parse_item=None, label=""):
+    parse_item = parse_item or _text
+    baseline, base_time = _timed(content, None, "html.parser", select_items, parse_item)
+    scoped, scoped_time = _timed(content, keep_classes, PARSER_BACKEND, select_items, parse_item)
+
+    same = baseline == scoped
+    print(
+        f"🔬 {label or 'parser'}: html.parser full {base_time * 1000:.1f} ms / "
+        f"{PARSER_BACKEND} scoped {scoped_time * 1000:.1f} ms, "
+        f"{len(baseline)} vs {len(scoped)} items, {'identical' if same else 'DIFFERENT'}"
+    )
+    if not same:
+        for i, (a, b) in enumerate(zip(baseline, scoped)):
+            if a != b:
+                print(f"   first difference at item {i}:\n   full:   {a}\n   scoped: {b}")
+                break
+    return same
+
+
+def listing_items(content, keep_classes, select_items, parse_item=None, label=""):
+    # Returns (soup, items) for the pagination engine; the soup only holds the kept containers
+    if COMPARE_BACKENDS:
+        compare_backends(content, keep_classes, select_items, parse_item, label)
+    soup = make_soup(content, keep_classes)
+    return soup, select_items(soup)
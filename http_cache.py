@@ -0,0 +1,226 @@
+import os
+import json
+import zlib
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# On-disk conditional cache: validators in <key>.json, zlib-compressed body in <key>.body
+CACHE_DIR = Path(os.environ.get("SCRAPER_HTTP_CACHE_DIR", ".http_cache"))
+MAX_CACHE_BYTES = int(float(os.environ.get("SCRAPER_HTTP_CACHE_MB", "500")) * 1024 * 1024)
+ENABLED = os.environ.get("SCRAPER_HTTP_CACHE", "1") != "0"
+
+# In-process memo of recent 200 bodies, so concurrent or repeated fetches of one URL in a run
+# (product pages shared by listings) hit the network once; least recently used goes first
+MEMO_BYTES = int(float(os.environ.get("SCRAPER_HTTP_MEMO_MB", "32")) * 1024 * 1024)
+
+# Response headers kept alongside the body so a 304 can be turned back into a full response
+KEPT_HEADERS = ["Content-Type", "ETag", "Last-Modified", "X-WP-Total", "X-WP-TotalPages"]
+
+_memo = OrderedDict()
+_memo_bytes = 0
+_url_locks = {}
+_lock = threading.Lock()
+_disk_bytes = None
+
+
+def _key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _paths(url):
+    key = _key(url)
+    return CACHE_DIR / f"{key}.json", CACHE_DIR / f"{key}.body"
+
+
+@contextmanager
+def url_lock(url):
+    # Serializes fetches of one URL so concurrent workers reuse the first response; the
+    # lock is dropped again once nobody is waiting on it
+    with _lock:
+        entry = _url_locks.get(url)
+        if entry is None:
+            entry = _url_locks[url] = [threading.Lock(), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _url_locks[url]
+
+
+def memo_get(url):
+    with _lock:
+        entry = _memo.get(url)
+        if entry is None:
+            return None
+        _memo.move_to_end(url)
+    body, headers = entry
+    return _response(url, body, headers)
+
+
+def memo_put(url, response):
+    # Keeps the body and headers only, never the Response with its connection and raw stream
+    global _memo_bytes
+    body = response.content
+    if len(body) > MEMO_BYTES:
+        return
+    with _lock:
+        old = _memo.pop(url, None)
+        if old is not None:
+            _memo_bytes -= len(old[0])
+        _memo[url] = (body, dict(response.headers))
+        _memo_bytes += len(body)
+        while _memo_bytes > MEMO_BYTES:
+            _, (dropped, _) = _memo.popitem(last=False)
+            _memo_bytes -= len(dropped)
+
+
+def clear_memo():
+    global _memo_bytes
+    with _lock:
+        _memo.clear()
+        _memo_bytes = 0
+
+
+def _response(url, body, headers):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def load(url):
+    meta_path, body_path = _paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("url") != url or not body_path.exists():
+        return None
+    return meta
+
+
+def conditional_headers(meta):
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def cached_response(url, meta):
+    meta_path, body_path = _paths(url)
+    body = zlib.decompress(body_path.read_bytes())
+
+    now = time.time()
+    os.utime(meta_path, (now, now))
+
+    response = _response(url, body, meta.get("headers", {}))
+    response.from_cache = True
+    return response
+
+
+def store(url, response):
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    meta_path, body_path = _paths(url)
+    body = zlib.compress(response.content, 6)
+    meta = {
+        "url": url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+        "stored_at": time.time(),
+        "size": len(body),
+    }
+
+    old_size = _entry_size(meta_path)
+    tmp_body = body_path.with_suffix(f".body.{threading.get_ident()}.tmp")
+    tmp_meta = meta_path.with_suffix(f".json.{threading.get_ident()}.tmp")
+    tmp_body.write_bytes(body)
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_body, body_path)
+    os.replace(tmp_meta, meta_path)
+
+    _grow(len(body) - old_size)
+
+
+def _entry_size(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("size", 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _scan():
+    total = 0
+    entries = []
+    for meta_path in CACHE_DIR.glob("*.json"):
+        body_path = meta_path.with_suffix(".body")
+        try:
+            size = body_path.stat().st_size
+            used = meta_path.stat().st_mtime
+        except OSError:
+            continue
+        total += size
+        entries.append((used, size, meta_path, body_path))
+    return total, entries
+
+
+def _grow(delta):
+    global _disk_bytes
+    with _lock:
+        if _disk_bytes is None:
+            _disk_bytes = _scan()[0]
+        else:
+            _disk_bytes += delta
+        over = _disk_bytes > MAX_CACHE_BYTES
+
+    if over:
+        evict()
+
+
+def evict(max_bytes=None):
+    # Least-recently-used first: hits touch the .json file, so its mtime is the last use
+    global _disk_bytes
+    limit = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+
+    with _lock:
+        total, entries = _scan()
+        removed = 0
+        for _, size, meta_path, body_path in sorted(entries):
+            if total <= limit * 0.9:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        _disk_bytes = total
+
+    if removed:
+        print(f"🧹 Evicted {removed} cached pages, cache now {total / 1024 / 1024:.1f} MB")
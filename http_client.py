@@ -0,0 +1,265 @@
+import time
+import random
+import threading
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+import deadlines
+import http_cache
+import proxy_pool
+import rate_control
+import response_archive
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
+    "Mozilla/5.0 (X11; Linux x86_64)",
+    "Mozilla/5.0 (Windows NT 6.1; WOW64)",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; rv:109.0) Gecko/20100101 Firefox/117.0",
+]
+
+# (connect, read) seconds applied to every request unless the caller overrides it
+DEFAULT_TIMEOUT = (5, 20)
+
+# Keep-alive connections kept open per host
+POOL_SIZE = 10
+
+# Bodies are read in chunks of this size, checking the request deadline between them
+CHUNK_BYTES = 64 * 1024
+
+# urllib3 only decodes brotli when one of these packages is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENTS[0],
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+}
+
+_sessions = {}
+_stats = {}
+_observers = []
+_lock = threading.Lock()
+
+
+def host_of(url):
+    return urlparse(url).netloc.lower()
+
+
+def random_user_agent():
+    return random.choice(USER_AGENTS)
+
+
+def get_session(url):
+    host = host_of(url)
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            _sessions[host] = session
+            _stats[host] = {"requests": 0, "bytes": 0, "wire_bytes": 0, "memo_hits": 0, "not_modified": 0}
+        return session
+
+
+def set_cookies(url, cookies):
+    # cookies is a browser-style list of {"name", "value", "domain", "path"} dicts
+    session = get_session(url)
+    for cookie in cookies:
+        session.cookies.set(
+            cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/")
+        )
+
+
+def add_observer(fn):
+    # fn(url, status, latency_seconds, body_bytes, waited_seconds) is called after every
+    # network request; waited is the time the rate controller held it back
+    _observers.append(fn)
+
+
+def remove_observer(fn):
+    if fn in _observers:
+        _observers.remove(fn)
+
+
+def _count(host, field):
+    with _lock:
+        _stats[host][field] += 1
+
+
+def _record(host, response):
+    body = len(response.content)
+    try:
+        wire = response.raw.tell() or body
+    except Exception:
+        wire = body
+
+    with _lock:
+        s = _stats[host]
+        s["requests"] += 1
+        s["bytes"] += body
+        s["wire_bytes"] += wire
+
+
+def get(url, headers=None, rotate_user_agent=False, timeout=DEFAULT_TIMEOUT, use_cache=True, deadline=None, **kwargs):
+    # Replay serves the archived day and never touches the network
+    if response_archive.replay_day():
+        return response_archive.replay_response(url)
+
+    # Extra request options (params, cookies, ...) change the response, so only plain GETs are cached
+    if not (use_cache and http_cache.ENABLED and not kwargs):
+        response = _fetch(url, headers, rotate_user_agent, timeout, deadline, **kwargs)
+        response_archive.record(url, host_of(url), response)
+        return response
+
+    with http_cache.url_lock(url):
+        response = http_cache.memo_get(url)
+        if response is not None:
+            get_session(url)
+            _count(host_of(url), "memo_hits")
+            return response
+
+        entry = http_cache.load(url)
+        conditional = dict(http_cache.conditional_headers(entry)) if entry else {}
+        conditional.update(headers or {})
+
+        response = _fetch(url, conditional, rotate_user_agent, timeout, deadline)
+        if response.status_code == 304 and entry:
+            _count(host_of(url), "not_modified")
+            response = http_cache.cached_response(url, entry)
+        elif response.status_code == 200:
+            http_cache.store(url, response)
+        response_archive.record(url, host_of(url), response)
+
+        if response.status_code == 200:
+            http_cache.memo_put(url, response)
+        return response
+
+
+def _chunks(response):
+    # urllib3 2's read1 hands back whatever has arrived; iter_content would wait for a full chunk
+    raw = response.raw
+    if not hasattr(raw, "read1"):
+        yield from response.iter_content(CHUNK_BYTES)
+        return
+    try:
+        while chunk := raw.read1(CHUNK_BYTES, decode_content=True):
+            yield chunk
+    except urllib3.exceptions.HTTPError as e:
+        raise requests.ConnectionError(e, response=response)
+
+
+def _read_body(response, deadline):
+    # A server that trickles bytes never trips the read timeout, so the deadline is checked per chunk
+    chunks = []
+    for chunk in _chunks(response):
+        chunks.append(chunk)
+        deadline.check(f"{response.url} finished downloading", margin=0)
+    response._content = b"".join(chunks)
+
+
+def _fetch(url, headers, rotate_user_agent, timeout, deadline, **kwargs):
+    session = get_session(url)
+    request_headers = {}
+    if rotate_user_agent:
+        request_headers["User-Agent"] = random_user_agent()
+    if headers:
+        request_headers.update(headers)
+
+    # Each proxy exit is rate controlled on its own, so a host's throughput grows with the exits
+    exit = proxy_pool.choose(url)
+    if exit is not None:
+        kwargs["proxies"] = exit.proxies
+    controller = rate_control.controller_for(url, via=exit.name if exit else None)
+    try:
+        waited = controller.acquire(deadline)
+    except deadlines.DeadlineExceeded:
+        proxy_pool.release(exit, url, abandoned=True)
+        raise
+    # The socket timeouts only bound each read; this bounds the whole request once it has its slot
+    request = deadlines.Deadline(deadlines.REQUEST_SECONDS, deadline, "request")
+    start = time.monotonic()
+    response = None
+    error = None
+    abandoned = False
+    try:
+        response = session.get(url, headers=request_headers, timeout=request.timeout(timeout), stream=True, **kwargs)
+        try:
+            _read_body(response, request)
+        except BaseException:
+            response.close()
+            response = None
+            raise
+    except (requests.Timeout, deadlines.DeadlineExceeded) as e:
+        # Cut short by the caller's deadline rather than by a slow host, so the host is not slowed down
+        if deadline is not None and deadline.expired():
+            abandoned = True
+            raise deadlines.DeadlineExceeded(f"{deadline.label} deadline reached mid-request") from e
+        raise
+    except requests.RequestException as e:
+        error = e
+        raise
+    finally:
+        latency = time.monotonic() - start
+        # Neither a request the caller gave up on nor an unreachable proxy says anything about the host
+        controller.release(
+            response.status_code if response is not None else None,
+            latency,
+            response.headers.get("Retry-After") if response is not None else None,
+            abandoned=abandoned or isinstance(error, requests.exceptions.ProxyError),
+        )
+        proxy_pool.release(
+            exit, url, response.status_code if response is not None else None, latency, error, abandoned
+        )
+        # Connection errors, timeouts and cut-off downloads are reported with status None before they propagate
+        if response is None:
+            for observer in list(_observers):
+                observer(url, None, latency, 0, waited)
+
+    # resilience benches the exit when the response turns out to be a block page
+    response.proxy_exit = exit
+    _record(host_of(url), response)
+    for observer in list(_observers):
+        observer(url, response.status_code, latency, len(response.content), waited)
+    return response
+
+
+def stats():
+    with _lock:
+        return {host: dict(s) for host, s in _stats.items()}
+
+
+def print_stats():
+    snapshot = stats()
+    if not snapshot:
+        return
+
+    print("\n🌐 HTTP client stats:")
+    for host, s in sorted(snapshot.items()):
+        print(
+            f"  {host:<20} {s['requests']:5d} requests  {s['bytes'] / 1024:9.1f} KB body  {s['wire_bytes'] / 1024:9.1f} KB wire"
+            f"  {s['not_modified']:4d} not modified  {s['memo_hits']:4d} memo hits"
+        )
+
+
+def close_all():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
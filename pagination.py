@@ -0,0 +1,198 @@
+import os
+import re
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import proxy_pool
+
+# Listing pages fetched at once per host (and per proxy exit), shared by every vendor job on that host
+PAGE_WORKERS = int(os.environ.get("SCRAPER_PAGE_WORKERS", "4"))
+
+# Hard stop for sequential probing in case a site never returns an empty page
+MAX_PAGES = 200
+
+RANGE_RE = re.compile(r"(\d[\d,]*)\s*(?:[-–—]|to)\s*(\d[\d,]*)\s+of\s+(\d[\d,]*)", re.I)
+ALL_RESULTS_RE = re.compile(r"showing (?:all \d[\d,]*|the single) results?", re.I)
+ITEMS_ONLY_RE = re.compile(r"^\s*(\d[\d,]*)\s+items?\s*$", re.I)
+
+# Classes the page-count readers look at, kept when listings are parsed container-only
+WOOCOMMERCE_PAGER_CLASSES = ["woocommerce-result-count", "woocommerce-pagination", "page-numbers"]
+MAGENTO_PAGER_CLASSES = ["toolbar-amount", "pages-items"]
+MICROLESS_PAGER_CLASSES = ["pagination", "pagination-info", "products-count", "showing-results", "listing-count"]
+OPENCART_PAGER_CLASSES = ["pagination", "pagination-results", "results"]
+
+# Magento's "Show N per page" toolbar select
+MAGENTO_LIMITER_CLASSES = ["limiter-options"]
+
+_budgets = {}
+_budgets_guard = threading.Lock()
+
+
+def _host_budget(url):
+    host = http_client.host_of(url)
+    with _budgets_guard:
+        if host not in _budgets:
+            _budgets[host] = threading.BoundedSemaphore(PAGE_WORKERS * proxy_pool.exit_count(host))
+        return _budgets[host]
+
+
+class ExactCount(int):
+    # A page count worked out from the results total ("1-24 of 57"), not from pager links that
+    # may be truncated; nothing lies past it, so the last page is never probed beyond
+    pass
+
+
+def _to_int(text):
+    return int(text.replace(",", ""))
+
+
+def pages_from_range_text(text):
+    match = RANGE_RE.search(text or "")
+    if not match:
+        return None
+
+    first, last, total = (_to_int(g) for g in match.groups())
+    per_page = last - first + 1
+    if per_page <= 0:
+        return None
+    return ExactCount(max(1, math.ceil(total / per_page)))
+
+
+def pages_from_links(soup, selector, pattern):
+    pages = [
+        int(m.group(1))
+        for a in soup.select(selector)
+        for m in [re.search(pattern, a.get("href", ""))]
+        if m
+    ]
+    return max(pages) if pages else None
+
+
+def woocommerce_page_count(soup):
+    count_tag = soup.select_one("p.woocommerce-result-count, .woocommerce-result-count")
+    if count_tag:
+        text = count_tag.get_text(" ", strip=True)
+        if ALL_RESULTS_RE.search(text):
+            return 1
+        pages = pages_from_range_text(text)
+        if pages:
+            return pages
+
+    return pages_from_links(soup, "a.page-numbers", r"/page/(\d+)/?")
+
+
+def magento_page_count(soup):
+    amount_tag = soup.select_one("p.toolbar-amount, #toolbar-amount")
+    if amount_tag:
+        text = amount_tag.get_text(" ", strip=True)
+        if ITEMS_ONLY_RE.match(text):
+            return 1
+        pages = pages_from_range_text(text)
+        if pages:
+            return pages
+
+    return pages_from_links(soup, "ul.pages-items a", r"[?&]p=(\d+)")
+
+
+def magento_page_sizes(soup):
+    # (offered page sizes, the one this page was rendered with) from the toolbar limiter
+    sizes, current = [], None
+    for option in soup.select("select.limiter-options option"):
+        value = option.get("value", "")
+        if value.isdigit():
+            sizes.append(int(value))
+            if option.has_attr("selected"):
+                current = int(value)
+    return sorted(set(sizes)), current
+
+
+def microless_page_count(soup):
+    for tag in soup.select(".pagination-info, .products-count, .showing-results, .listing-count"):
+        pages = pages_from_range_text(tag.get_text(" ", strip=True))
+        if pages:
+            return pages
+
+    return pages_from_links(soup, ".pagination a, ul.pagination a, a.page-link", r"[?&]page=(\d+)")
+
+
+
+def opencart_page_count(soup):
+    # "Showing 1 to 20 of 57 (3 Pages)"
+    for tag in soup.select(".pagination-results, div.results"):
+        pages = pages_from_range_text(tag.get_text(" ", strip=True))
+        if pages:
+            return pages
+
+    return pages_from_links(soup, "ul.pagination a", r"[?&]page=(\d+)")
+
+# Yields (page, items) in page order. page_url(n) builds the listing URL,
+# fetch_items(url) returns (soup, items) and count_pages(soup) reads the page
+# count from page 1; the "soup" can be anything count_pages understands. Known
+# counts are fetched concurrently within the host budget; unknown ones, and counts
+# read from pager links that end on a full page, fall back to probing until a page
+# comes back empty.
+# Pages in skip are neither fetched nor yielded; state records the page count
+# and page sizes so a resumed run can skip page 1 as well.
+def iter_pages(page_url, fetch_items, count_pages, workers=PAGE_WORKERS, skip=(), state=None):
+    budget = _host_budget(page_url(1))
+    skip = set(skip)
+    state = {} if state is None else state
+    sizes = state.setdefault("sizes", {})
+
+    def fetch(page):
+        with budget:
+            return fetch_items(page_url(page))
+
+    if 1 in skip and "total" in state:
+        total = state["total"]
+        exact = state.get("exact", False)
+    else:
+        soup, items = fetch(1)
+        sizes["1"] = len(items)
+        if not items:
+            return
+        if 1 not in skip:
+            yield 1, items
+
+        total = None
+        if soup is not None:
+            try:
+                total = count_pages(soup)
+            except Exception as e:
+                print(f"⚠️ Could not read page count: {e}")
+        exact = isinstance(total, ExactCount)
+        state["total"] = total
+        state["exact"] = exact
+
+    page_size = sizes.get("1", 0)
+    last_page = 1
+    if total and total > 1:
+        todo = [p for p in range(2, total + 1) if p not in skip]
+        if todo:
+            print(f"📄 Found {total} pages, fetching {len(todo)} ({min(workers, len(todo))} at a time)")
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as pool:
+                for page, (_, items) in zip(todo, pool.map(fetch, todo)):
+                    sizes[str(page)] = len(items)
+                    if items:
+                        yield page, items
+        last_page = total
+
+        # A full last page means a count from pager links may have been truncated; keep probing
+        if exact or sizes.get(str(total), 0) < page_size:
+            return
+    elif total == 1:
+        return
+
+    page = last_page + 1
+    while page <= MAX_PAGES:
+        if page in skip:
+            page += 1
+            continue
+        _, items = fetch(page)
+        sizes[str(page)] = len(items)
+        if not items:
+            return
+        yield page, items
+        page += 1
@@ -0,0 +1,51 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Processes that parse fetched HTML for every vendor; 0 parses in the fetching thread
+PARSE_WORKERS = int(os.environ.get("SCRAPER_PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+_lock = threading.Lock()
+_pool = None
+_broken = False
+
+
+def _get_pool():
+    global _pool
+    if PARSE_WORKERS <= 0 or _broken:
+        return None
+    with _lock:
+        if _pool is None:
+            # spawn, not fork: the parent is full of fetch threads holding locks
+            _pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+            print(f"🧮 Parsing HTML in {PARSE_WORKERS} worker processes")
+        return _pool
+
+
+def run(fn, *args):
+    # Runs fn(*args) in a parse process and waits for it. fn must be a module-level
+    # function and everything it needs has to travel in args.
+    global _broken
+    pool = _get_pool()
+    if pool is None:
+        return fn(*args)
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        with _lock:
+            if not _broken:
+                print("⚠️ Parse workers died; parsing in-process from now on")
+            _broken = True
+        return fn(*args)
+
+
+def shutdown():
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
@@ -0,0 +1,279 @@
+import os
+import time
+import random
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+# Proxy exits, one URL per line ("#" starts a comment, "direct" stands for our own address).
+# SCRAPER_PROXIES (comma separated) takes precedence over the file; no exits at all means
+# every request goes out directly, exactly as without this module.
+PROXY_FILE = Path(os.environ.get("SCRAPER_PROXY_FILE", "proxies.txt"))
+PROXY_LIST = os.environ.get("SCRAPER_PROXIES", "")
+
+DIRECT = "direct"
+
+# Health per exit and host: a moving success rate and latency. Exits below MIN_SUCCESS for a
+# host are only used when no healthier one is left.
+HEALTH_ALPHA = 0.2
+MIN_SUCCESS = 0.3
+LATENCY_FLOOR = 0.05
+
+# A proxy that cannot be reached this many times in a row is evicted for EVICT_SECONDS;
+# after that a single further failure evicts it again
+EVICT_FAILURES = int(os.environ.get("SCRAPER_PROXY_EVICT_FAILURES", "3"))
+EVICT_SECONDS = float(os.environ.get("SCRAPER_PROXY_EVICT_SECONDS", "300"))
+
+# An exit a host answers with a block page is benched for that host only
+BENCH_SECONDS = float(os.environ.get("SCRAPER_PROXY_BENCH_SECONDS", "900"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_exits = None
+_rules = {}
+_health = {}
+_pins = {}
+_lock = threading.Lock()
+
+
+def _host(url_or_host):
+    return urlparse(url_or_host).netloc.lower() if "://" in url_or_host else url_or_host.lower()
+
+
+class Exit:
+    # One way out to the sites: a proxy URL, or a direct connection
+    def __init__(self, url):
+        url = url.strip()
+        self.url = None if url == DIRECT else url
+        if self.url:
+            p = urlparse(self.url)
+            # Credentials stay out of names, logs and stats
+            self.name = f"{p.scheme}://{p.hostname}{f':{p.port}' if p.port else ''}"
+        else:
+            self.name = DIRECT
+        self.proxies = {"http": self.url, "https": self.url} if self.url else {}
+        self.failures = 0
+        self.evicted_until = 0.0
+        self.evictions = 0
+        self.requests = 0
+        self.errors = 0
+
+    def browser_proxy(self):
+        # The same exit in Playwright's proxy format
+        if not self.url:
+            return None
+        p = urlparse(self.url)
+        proxy = {"server": self.name}
+        if p.username:
+            proxy["username"] = p.username
+            proxy["password"] = p.password or ""
+        return proxy
+
+
+class Health:
+    def __init__(self):
+        self.success = 1.0
+        self.latency = None
+        self.inflight = 0
+        self.benched_until = 0.0
+        self.requests = 0
+
+    def score(self):
+        # Reliable, fast and idle exits first; new ones look perfect until proven otherwise
+        return self.success ** 2 / ((self.latency or 0.0) + LATENCY_FLOOR) / (1 + self.inflight)
+
+
+def load_exits():
+    if PROXY_LIST.strip():
+        lines = PROXY_LIST.split(",")
+    elif PROXY_FILE.exists():
+        lines = PROXY_FILE.read_text(encoding="utf-8").splitlines()
+    else:
+        lines = []
+    entries = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line and line not in entries:
+            entries.append(line)
+    return [Exit(entry) for entry in entries]
+
+
+def exits():
+    global _exits
+    with _lock:
+        if _exits is None:
+            _exits = load_exits()
+            if _exits:
+                print(f"🧭 Proxy pool: {len(_exits)} exits ({', '.join(e.name for e in _exits)})")
+        return _exits
+
+
+def configure(entries):
+    # Replaces the configured exits, e.g. with local stand-in proxies; [] turns proxies off
+    global _exits
+    with _lock:
+        _exits = [Exit(entry) for entry in entries]
+        _health.clear()
+        _pins.clear()
+
+
+def declare(url_or_host, sticky=False, use=True):
+    # sticky: every request to the host leaves through one exit, so cookies tied to an
+    # address stay valid; use=False keeps the host on direct connections
+    with _lock:
+        _rules[_host(url_or_host)] = {"sticky": sticky, "use": use}
+
+
+def _uses_pool(host):
+    return bool(exits()) and _rules.get(host, {}).get("use", True)
+
+
+def exit_count(url_or_host):
+    # Exits a host's requests are spread over; scales its worker counts
+    host = _host(url_or_host)
+    if not _uses_pool(host) or _rules.get(host, {}).get("sticky"):
+        return 1
+    return len(exits())
+
+
+def _health_of(exit, host):
+    key = (exit.name, host)
+    if key not in _health:
+        _health[key] = Health()
+    return _health[key]
+
+
+def _usable(exit, host, now):
+    return now >= exit.evicted_until and now >= _health_of(exit, host).benched_until
+
+
+def _best(host, now):
+    usable = [e for e in _exits if _usable(e, host, now)]
+    candidates = [e for e in usable if _health_of(e, host).success >= MIN_SUCCESS] or usable
+    if not candidates:
+        # Everything is evicted or benched: the exit that comes back first is the least bad
+        return min(_exits, key=lambda e: max(e.evicted_until, _health_of(e, host).benched_until))
+    return max(candidates, key=lambda e: (_health_of(e, host).score(), random.random()))
+
+
+def _pinned(host, now):
+    pin = _pins.get(host)
+    if pin is None or not _usable(pin, host, now):
+        previous, pin = pin, _best(host, now)
+        if pin is not previous:
+            print(f"📌 {host}: pinned to {pin.name}" + (f" (was {previous.name})" if previous else ""))
+        _pins[host] = pin
+    return pin
+
+
+def choose(url):
+    # The exit for one request, or None when the host goes out directly. Every chosen exit
+    # must be handed back through release().
+    host = _host(url)
+    if not _uses_pool(host):
+        return None
+    with _lock:
+        now = time.monotonic()
+        exit = _pinned(host, now) if _rules.get(host, {}).get("sticky") else _best(host, now)
+        _health_of(exit, host).inflight += 1
+        return exit
+
+
+def release(exit, url, status=None, latency=0.0, error=None, abandoned=False):
+    # Scores the exit on how the request went; abandoned requests (the caller ran out of
+    # time) say nothing about it
+    if exit is None:
+        return
+    host = _host(url)
+    with _lock:
+        h = _health_of(exit, host)
+        h.inflight -= 1
+        if abandoned:
+            return
+        exit.requests += 1
+        h.requests += 1
+
+        if isinstance(error, requests.exceptions.ProxyError):
+            exit.errors += 1
+            exit.failures += 1
+            h.success *= 1 - HEALTH_ALPHA
+            now = time.monotonic()
+            if exit.url and exit.failures >= EVICT_FAILURES and now >= exit.evicted_until:
+                exit.evicted_until = now + EVICT_SECONDS
+                exit.evictions += 1
+                exit.failures = EVICT_FAILURES - 1
+                print(f"🚫 {exit.name}: unreachable, evicted for {EVICT_SECONDS:.0f}s")
+            return
+
+        exit.failures = 0
+        if status is None or status in RETRY_STATUSES:
+            exit.errors += 1
+            h.success *= 1 - HEALTH_ALPHA
+        else:
+            h.success = h.success * (1 - HEALTH_ALPHA) + HEALTH_ALPHA
+            h.latency = latency if h.latency is None else HEALTH_ALPHA * latency + (1 - HEALTH_ALPHA) * h.latency
+
+
+def bench(exit, url):
+    # A block page came back through exit: the host has flagged that address. Returns True
+    # when another exit is left to try the host through.
+    if exit is None:
+        return False
+    host = _host(url)
+    with _lock:
+        now = time.monotonic()
+        h = _health_of(exit, host)
+        h.benched_until = now + BENCH_SECONDS
+        h.success *= 1 - HEALTH_ALPHA
+        if _pins.get(host) is exit:
+            del _pins[host]
+        print(f"🪑 {exit.name}: blocked by {host}, benched for {BENCH_SECONDS:.0f}s")
+        return any(_usable(e, host, now) for e in _exits)
+
+
+def browser_proxy(url):
+    # Playwright proxy for a sticky host's pinned exit, so browser cookies match later requests
+    host = _host(url)
+    if not _uses_pool(host) or not _rules.get(host, {}).get("sticky"):
+        return None
+    with _lock:
+        return _pinned(host, time.monotonic()).browser_proxy()
+
+
+def stats():
+    with _lock:
+        now = time.monotonic()
+        snapshot = {}
+        for exit in _exits or []:
+            snapshot[exit.name] = {
+                "requests": exit.requests,
+                "errors": exit.errors,
+                "evictions": exit.evictions,
+                "evicted": now < exit.evicted_until,
+                "hosts": {
+                    host: {
+                        "success": round(h.success, 2),
+                        "latency": round(h.latency, 3) if h.latency is not None else None,
+                        "benched": now < h.benched_until,
+                    }
+                    for (name, host), h in _health.items()
+                    if name == exit.name
+                },
+            }
+        return snapshot
+
+
+def print_stats():
+    snapshot = stats()
+    if not any(s["requests"] for s in snapshot.values()):
+        return
+
+    print("\n🧭 Proxy exits:")
+    for name, s in sorted(snapshot.items()):
+        state = "evicted" if s["evicted"] else "ok"
+        print(f"  {name:<28} {state:<8} {s['requests']:5d} requests  {s['errors']:4d} errors  {s['evictions']} evictions")
+        for host, h in sorted(s["hosts"].items()):
+            latency = f"{h['latency']:.2f}s" if h["latency"] is not None else "-"
+            print(f"    {host:<26} success {h['success']:.2f}  latency {latency:>6}{'  benched' if h['benched'] else ''}")
@@ -0,0 +1,184 @@
+import os
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Politeness ceiling for hosts that never declared one
+DEFAULT_MAX_RPS = float(os.environ.get("SCRAPER_DEFAULT_MAX_RPS", "4"))
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("SCRAPER_DEFAULT_MAX_CONCURRENCY", "4"))
+
+# Every host starts cautious and earns its way up to the ceiling
+START_RPS = 1.0
+START_CONCURRENCY = 2.0
+MIN_RPS = 0.1
+
+# AIMD tuning: additive step per good response, multiplicative cut on trouble
+RATE_STEP = 0.2
+BACKOFF_FACTOR = 0.5
+SLOWDOWN_FACTOR = 0.8
+LATENCY_ALPHA = 0.2
+LATENCY_BACKOFF_RATIO = 2.0
+DEFAULT_BLOCK_SECONDS = 5.0
+
+BACKOFF_STATUSES = {429, 503}
+
+_controllers = {}
+_ceilings = {}
+_lock = threading.Lock()
+
+
+def _host(url_or_host):
+    return urlparse(url_or_host).netloc.lower() if "://" in url_or_host else url_or_host.lower()
+
+
+def declare(url_or_host, max_rps=DEFAULT_MAX_RPS, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    host = _host(url_or_host)
+    with _lock:
+        _ceilings[host] = (max_rps, max_concurrency)
+        for key, controller in _controllers.items():
+            if key == host or key.startswith(f"{host} via "):
+                controller.set_ceiling(max_rps, max_concurrency)
+
+
+def controller_for(url_or_host, via=None):
+    # via names the proxy exit; each exit to a host gets its own controller under the host's ceiling
+    host = _host(url_or_host)
+    key = f"{host} via {via}" if via else host
+    with _lock:
+        if key not in _controllers:
+            max_rps, max_concurrency = _ceilings.get(host, (DEFAULT_MAX_RPS, DEFAULT_MAX_CONCURRENCY))
+            _controllers[key] = HostController(key, max_rps, max_concurrency)
+        return _controllers[key]
+
+
+def retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostController:
+    # Token bucket for request starts plus an AIMD window on requests in flight
+    def __init__(self, host, max_rps, max_concurrency):
+        self.host = host
+        self.cond = threading.Condition()
+        self.max_rps = max_rps
+        self.max_concurrency = max_concurrency
+        self.rate = min(START_RPS, max_rps)
+        self.window = min(START_CONCURRENCY, float(max_concurrency))
+        self.tokens = 1.0
+        self.refilled = time.monotonic()
+        self.inflight = 0
+        self.blocked_until = 0.0
+        self.latency = None
+        self.baseline = None
+        self.waited = 0.0
+        self.backoffs = 0
+
+    def set_ceiling(self, max_rps, max_concurrency):
+        with self.cond:
+            self.max_rps = max_rps
+            self.max_concurrency = max_concurrency
+            self.rate = min(self.rate, max_rps)
+            self.window = min(self.window, float(max_concurrency))
+
+    def _refill(self, now):
+        burst = max(1.0, self.window)
+        self.tokens = min(burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+
+    def acquire(self, deadline=None):
+        # Blocks until a request may start; returns the seconds spent waiting. Raises
+        # DeadlineExceeded instead of waiting past the caller's deadline.
+        start = time.monotonic()
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.inflight >= max(1, int(self.window)):
+                    wait = 0.5
+                elif self.tokens < 1.0:
+                    wait = (1.0 - self.tokens) / self.rate
+                else:
+                    self.tokens -= 1.0
+                    self.inflight += 1
+                    self.waited += now - start
+                    return now - start
+                if deadline is not None:
+                    deadline.check("a request slot was free")
+                    wait = min(wait, deadline.remaining())
+                self.cond.wait(timeout=wait)
+
+    def release(self, status, latency, retry_after=None, abandoned=False):
+        # abandoned: the caller gave up on the request, which says nothing about the host
+        with self.cond:
+            self.inflight -= 1
+            if abandoned:
+                pass
+            elif status is None or status in BACKOFF_STATUSES:
+                self._back_off(retry_after, blocked=status is not None)
+            elif status < 500:
+                self._observe_latency(latency)
+            self.cond.notify_all()
+
+    def _back_off(self, retry_after, blocked):
+        self.backoffs += 1
+        self.rate = max(MIN_RPS, self.rate * BACKOFF_FACTOR)
+        self.window = max(1.0, self.window * BACKOFF_FACTOR)
+        # A 429/503 without a usable Retry-After still pauses the host briefly; network errors do not
+        pause = retry_after_seconds(retry_after)
+        if pause is None:
+            pause = DEFAULT_BLOCK_SECONDS if blocked else 0.0
+        if pause:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+        print(f"🐢 {self.host}: backing off to {self.rate:.2f} req/s, {int(self.window)} in flight")
+
+    def _observe_latency(self, latency):
+        self.latency = latency if self.latency is None else (
+            LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency
+        )
+        # Let the baseline drift up slowly so a permanently slower site is not punished forever
+        self.baseline = self.latency if self.baseline is None else min(self.latency, self.baseline * 1.01)
+
+        if self.latency > self.baseline * LATENCY_BACKOFF_RATIO:
+            self.rate = max(MIN_RPS, self.rate * SLOWDOWN_FACTOR)
+            self.window = max(1.0, self.window * SLOWDOWN_FACTOR)
+        else:
+            self.rate = min(self.max_rps, self.rate + RATE_STEP)
+            self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+
+    def snapshot(self):
+        with self.cond:
+            return {
+                "rate": round(self.rate, 2),
+                "window": round(self.window, 2),
+                "latency": round(self.latency, 3) if self.latency is not None else None,
+                "waited": round(self.waited, 1),
+                "backoffs": self.backoffs,
+            }
+
+
+def stats():
+    with _lock:
+        controllers = dict(_controllers)
+    return {host: c.snapshot() for host, c in controllers.items()}
+
+
+def print_stats():
+    snapshot = stats()
+    if not snapshot:
+        return
+
+    print("\n🚦 Rate controller:")
+    for host, s in sorted(snapshot.items()):
+        print(f"  {host:<20} {s['rate']:5.2f} req/s  window {s['window']:4.1f}  waited {s['waited']:7.1f}s  {s['backoffs']} backoffs")
@@ -0,0 +1,318 @@
+import os
+import csv
+import json
+import math
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+import stock_checks
+from fingerprints import STATE_DIR, FingerprintIndex
+from vendor_specs import SPECS
+
+# Normalized daily snapshots (normalize_scraped_data.py) the change rates are learned from
+HISTORY_DIR = Path(os.environ.get("SCRAPER_HISTORY_DIR", "data_archive"))
+HISTORY_DAYS = int(os.environ.get("SCRAPER_HISTORY_DAYS", "30"))
+
+# Product-page stock checks per run across all vendors; 0 goes back to the per-spec price/title rules.
+# The default stays under the ~177 checks a full run made with those rules alone.
+REQUEST_BUDGET = int(os.environ.get("SCRAPER_REFRESH_BUDGET", "150"))
+
+# Share of the budget kept for products that are new, whose listing card changed, or whose
+# last check is older than the fingerprint age cap (SCRAPER_FINGERPRINT_MAX_AGE_HOURS)
+RESERVE_SHARE = 0.25
+
+# A product's own history counts as much as PRIOR_DAYS of its vendor's average, and no
+# rate goes below MIN_RATE changes per day (a few quiet days prove little)
+PRIOR_DAYS = 7.0
+MIN_RATE = 0.01
+
+# Known products are not checked again until they have at least this chance of having changed
+MIN_CHANGE_CHANCE = 0.02
+
+# Price (AED) that weighs 1; a product's weight grows with the square root of its price
+VALUE_SCALE = 1000.0
+
+# Weight for products the spec singles out (its stock_check rule or refresh "focus" terms)
+FOCUS_WEIGHT = 3.0
+
+# A category is scraped again once this share of its products is expected to have
+# changed since its last run, and never less often than every MAX_INTERVAL_DAYS
+VENDOR_MIN_CHANGE = float(os.environ.get("SCRAPER_VENDOR_MIN_CHANGE", "0.01"))
+MAX_INTERVAL_DAYS = int(os.environ.get("SCRAPER_MAX_INTERVAL_DAYS", "7"))
+
+STATE_PATH = STATE_DIR / "refresh_schedule.json"
+
+# Normalization re-reads every export still in the folder, so a snapshot also repeats
+# older days; only rows from that day's own exports count
+SOURCE_DATE = re.compile(r"_(\d{4}-\d{2}-\d{2})\.csv$")
+
+_lock = threading.Lock()
+_history = None
+_plan = None
+_run_active = False
+
+
+def load_history(archive_dir=HISTORY_DIR, days=HISTORY_DAYS):
+    # Walks the last `days` snapshots in date order and counts, per product, how often its
+    # price or stock changed between two observations and over how many days
+    products, vendors = {}, {}
+    files = sorted(Path(archive_dir).glob("normalized_daily_*.csv"))[-days:] if days else []
+    for path in files:
+        try:
+            day = date.fromisoformat(path.stem.removeprefix("normalized_daily_"))
+        except ValueError:
+            continue
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                vendor, url = row.get("VendorKey") or "", row.get("product_url") or ""
+                # normalized_combined.csv can sit in the exports folder and repeat every row
+                if not vendor or not url or vendor == "normalized_combined":
+                    continue
+                stamped = SOURCE_DATE.search(row.get("source_file", ""))
+                if stamped and stamped.group(1) != day.isoformat():
+                    continue
+                observed = (row.get("price", ""), row.get("stock_status", ""))
+                p = products.get((vendor, url))
+                if p is None:
+                    products[(vendor, url)] = p = {"changes": 0, "days": 0, "seen": observed, "day": day}
+                elif p["day"] < day:
+                    changed = p["seen"] != observed
+                    p["changes"] += changed
+                    p["days"] += (day - p["day"]).days
+                    v = vendors.setdefault(vendor, {"changes": 0, "days": 0})
+                    v["changes"] += changed
+                    v["days"] += (day - p["day"]).days
+                    p["seen"], p["day"] = observed, day
+                p["name"] = row.get("product_name", "")
+                p["price"] = _price(row.get("price"))
+    return {"products": products, "vendors": vendors}
+
+
+def history():
+    global _history
+    with _lock:
+        if _history is None:
+            _history = load_history()
+        return _history
+
+
+def reload_history():
+    # After normalization adds a snapshot; the next plan reads the archive again
+    global _history
+    with _lock:
+        _history = None
+
+
+def _price(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def vendor_rate(vendor_key):
+    v = history()["vendors"].get(vendor_key)
+    if not v or not v["days"]:
+        return None
+    return max(MIN_RATE, v["changes"] / v["days"])
+
+
+def product_rate(vendor_key, url):
+    prior = vendor_rate(vendor_key) or MIN_RATE
+    p = history()["products"].get((vendor_key, url))
+    if not p:
+        return prior
+    return max(MIN_RATE, (p["changes"] + PRIOR_DAYS * prior) / (p["days"] + PRIOR_DAYS))
+
+
+def refresh_rule(spec):
+    return spec.get("refresh", {})
+
+
+def focused(spec, product_name, price):
+    # Products the spec cares most about: its old stock_check rule plus any refresh "focus" terms
+    terms = list(refresh_rule(spec).get("focus", []))
+    rule = spec.get("stock_check") or {}
+    if rule.get("when") == "title_contains":
+        terms += rule["terms"]
+    elif rule.get("when") == "price_above" and stock_checks.needs_check(price):
+        return True
+    return any(term.lower() in product_name.lower() for term in terms)
+
+
+def priority(spec, url, name, price, checked_at, now):
+    # Expected value of checking now: chance the product changed since its last check,
+    # weighted by its price and by how much the spec cares about it
+    key = spec.get("export_name", spec["name"])
+    if checked_at is None:
+        stale = 1.0
+    else:
+        age = max(0.0, (now - checked_at).total_seconds() / 86400)
+        stale = 1 - math.exp(-product_rate(key, url) * age)
+        if stale < MIN_CHANGE_CHANCE:
+            return 0.0
+    weight = refresh_rule(spec).get("weight", 1.0) * math.sqrt(max(price, 1.0) / VALUE_SCALE)
+    if focused(spec, name, price):
+        weight *= FOCUS_WEIGHT
+    return weight * stale
+
+
+class RefreshPlan:
+    # The product pages worth a stock check this run: `due` holds the best known products
+    # up to the budget minus the reserve, which goes to new or changed cards as they appear.
+    # `cutoff` is the priority of the weakest product that made it into `due`.
+    def __init__(self, due, reserve, cutoff=0.0):
+        self.due = due
+        self.reserve = reserve
+        self.cutoff = cutoff
+        # Cards worth less than the cutoff may take at most half of the reserve
+        self.low_reserve = reserve // 2
+        self.lock = threading.Lock()
+        self.stats = {"due": 0, "new_or_changed": 0, "carried": 0, "not_checked": 0, "over_budget": 0}
+
+    def wants(self, spec, row, index, on_floor):
+        # True when the row's stock should be checked. An unchanged card checked within the
+        # fingerprint age cap carries its previous result forward. Other cards only get a
+        # reserve slot when the spec's own rule (on_floor) would have checked them, and
+        # the last slots are kept for cards worth at least the weakest scheduled product.
+        url = row.get("Product URL", "")
+        if (spec["name"], url) in self.due:
+            self._count("due")
+            return True
+        if index.carry_forward(row):
+            self._count("carried")
+            return False
+        if not on_floor:
+            self._count("not_checked")
+            return False
+        value = priority(spec, url, row.get("Product Name", ""), row_price(spec, row), None, datetime.now())
+        with self.lock:
+            if self.reserve <= 0 or (value < self.cutoff and self.low_reserve <= 0):
+                self.stats["over_budget"] += 1
+                return False
+            self.reserve -= 1
+            if value < self.cutoff:
+                self.low_reserve -= 1
+            self.stats["new_or_changed"] += 1
+        return True
+
+    def _count(self, field):
+        with self.lock:
+            self.stats[field] += 1
+
+    def print_stats(self):
+        s = self.stats
+        if any(s.values()):
+            print(
+                f"\n🗓️ Refresh plan: {s['due']} scheduled checks, {s['new_or_changed']} new, changed or expired products,"
+                f" {s['carried']} carried forward, {s['not_checked']} outside the spec rules, {s['over_budget']} over budget"
+            )
+
+
+def row_price(spec, row):
+    # The listing price the spec's price rule reads, or the plain AED price
+    field = (spec.get("stock_check") or {}).get("price_field", "Price (AED)")
+    return _price(row.get(field))
+
+
+def build_plan(names, budget=None):
+    # Ranks every known product of the vendors that check stock and keeps the top of the budget
+    budget = REQUEST_BUDGET if budget is None else budget
+    now = datetime.now()
+    ranked = []
+    for name in names:
+        spec = SPECS.get(name)
+        if not spec or not spec.get("stock_check"):
+            continue
+        spec = {"name": name, **spec}
+        key = spec.get("export_name", name)
+        index = FingerprintIndex(name)
+        checked = {}
+        for url, entry in index.previous.items():
+            try:
+                checked_at = datetime.fromisoformat(entry["checked_at"])
+            except (KeyError, ValueError):
+                continue
+            # Past the age cap a result cannot be carried forward, so it ranks as never checked
+            if now - checked_at <= index.max_age:
+                checked[url] = checked_at
+        known = {url for (vendor, url) in history()["products"] if vendor == key} | set(checked)
+        for url in known:
+            p = history()["products"].get((key, url), {})
+            score = priority(spec, url, p.get("name", ""), p.get("price", 0.0), checked.get(url), now)
+            ranked.append((score, name, url))
+
+    ranked.sort(reverse=True)
+    top = [(score, name, url) for score, name, url in ranked[: int(budget * (1 - RESERVE_SHARE))] if score > 0]
+    due = {(name, url) for score, name, url in top}
+    reserve = budget - len(due)
+    if any(SPECS.get(name, {}).get("stock_check") for name in names):
+        print(f"🗓️ Planned {len(due)} stock checks out of {len(ranked)} known products, {reserve} kept for new or changed ones")
+    return RefreshPlan(due, reserve, cutoff=top[-1][0] if top else 0.0)
+
+
+def start_run(names):
+    # One plan (and one budget) per orchestrated run
+    global _plan, _run_active
+    _plan = build_plan(names) if REQUEST_BUDGET > 0 else None
+    _run_active = True
+    return _plan
+
+
+def plan_for(name):
+    # scrape_vendor called outside run_batch (e.g. microless_gpu.scrape() from another
+    # script, or bench_replay's vendor loop) gets a fresh plan that is not kept, so the
+    # next vendor does not inherit its schedule and spent reserve
+    if REQUEST_BUDGET <= 0:
+        return None
+    if _run_active:
+        return _plan
+    return build_plan([name])
+
+
+def finish_run():
+    global _plan, _run_active
+    if _plan is not None:
+        _plan.print_stats()
+    _plan = None
+    _run_active = False
+
+
+def _load_state():
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def vendor_due(name, today=None):
+    # (due, reason): whether the category has likely changed enough to be worth scraping again
+    spec = SPECS.get(name)
+    last = _load_state().get("vendors", {}).get(name)
+    if spec is None or last is None:
+        return True, "never scraped"
+
+    age = ((today or date.today()) - date.fromisoformat(last)).days
+    if age >= MAX_INTERVAL_DAYS:
+        return True, f"last scraped {age} days ago"
+    rate = vendor_rate(spec.get("export_name", name))
+    if rate is None:
+        return True, "no history"
+    expected = 1 - math.exp(-rate * refresh_rule(spec).get("weight", 1.0) * age)
+    if expected >= VENDOR_MIN_CHANGE:
+        return True, f"~{expected:.1%} of products changed"
+    return False, f"only ~{expected:.1%} of products expected to change since {last}"
+
+
+def vendor_done(name, day=None):
+    with _lock:
+        state = _load_state()
+        state.setdefault("vendors", {})[name] = (day or date.today()).isoformat()
+        STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_PATH.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp, STATE_PATH)
@@ -0,0 +1,229 @@
+import os
+import time
+import random
+import threading
+
+import requests
+
+import deadlines
+import http_client
+import proxy_pool
+import rate_control
+import response_archive
+import telemetry
+
+# Attempts per fetch, and the exponential backoff (with full jitter) between them
+MAX_ATTEMPTS = int(os.environ.get("SCRAPER_RETRIES", "3"))
+BACKOFF_BASE = float(os.environ.get("SCRAPER_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = 30.0
+
+# A Retry-After longer than this is not waited out: the host's breaker opens for that long instead
+MAX_RETRY_AFTER = float(os.environ.get("SCRAPER_MAX_RETRY_AFTER", "60"))
+
+# Consecutive failures that open a host's breaker, and how long it stays open
+BREAKER_FAILURES = int(os.environ.get("SCRAPER_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("SCRAPER_BREAKER_COOLDOWN", "60"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Challenge pages: any marker on a 403/503, only the interstitial title on a 200
+# (normal Cloudflare pages also load /cdn-cgi/challenge-platform/ scripts)
+CHALLENGE_MARKERS = [
+    "<title>just a moment...</title>", "attention required! | cloudflare",
+    "cf-browser-verification", "cf_chl_opt", "challenge-platform",
+]
+CHALLENGE_TITLE = "<title>just a moment...</title>"
+
+
+class FetchError(Exception):
+    pass
+
+
+class BlockedError(FetchError):
+    pass
+
+
+class CircuitOpenError(FetchError):
+    pass
+
+
+class DeadlineError(FetchError):
+    pass
+
+
+def backoff(attempt):
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def is_block_page(response):
+    if response.headers.get("cf-mitigated", "").lower() == "challenge":
+        return True
+    if response.status_code not in (200, 403, 503):
+        return False
+    head = response.content[:20000].decode("utf-8", "ignore").lower()
+    if response.status_code == 200:
+        return CHALLENGE_TITLE in head
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+def classify(response):
+    # "ok" (use it, 404 included), "blocked" (a challenge page; retrying will not help) or "retry"
+    if is_block_page(response):
+        return "blocked"
+    if response.status_code in RETRY_STATUSES:
+        return "retry"
+    return "ok"
+
+
+class CircuitBreaker:
+    # closed -> open after BREAKER_FAILURES failures in a row (or at once on a block page),
+    # open -> half-open after the cooldown, where a single trial request decides
+    def __init__(self, host):
+        self.host = host
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.open_until = 0.0
+        self.trial_running = False
+        self.opened = 0
+        self.rejected = 0
+        self.blocked = 0
+
+    def before(self):
+        with self.lock:
+            now = time.monotonic()
+            if now < self.open_until or (self.open_until and self.trial_running):
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.host} is failing; not retrying for {max(0, self.open_until - now):.0f}s")
+            if self.open_until:
+                self.trial_running = True
+
+    def success(self):
+        with self.lock:
+            if self.open_until:
+                print(f"🟢 {self.host}: circuit closed again")
+            self.failures = 0
+            self.open_until = 0.0
+            self.trial_running = False
+
+    def abandon(self):
+        # The caller gave up before an answer came back; says nothing about the host
+        with self.lock:
+            self.trial_running = False
+
+    def failure(self, blocked=False, open_for=None):
+        with self.lock:
+            self.failures += 1
+            self.blocked += blocked
+            self.trial_running = False
+            if blocked or open_for or self.failures >= BREAKER_FAILURES or self.open_until:
+                self._open(open_for or BREAKER_COOLDOWN)
+
+    def _open(self, seconds):
+        self.open_until = time.monotonic() + seconds
+        self.opened += 1
+        print(f"🔴 {self.host}: circuit open for {seconds:.0f}s after {self.failures} failures")
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "open": time.monotonic() < self.open_until,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "blocked": self.blocked,
+            }
+
+
+_breakers = {}
+_lock = threading.Lock()
+
+
+def breaker_for(url):
+    host = http_client.host_of(url)
+    with _lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def fetch(url, attempts=None, rotate_user_agent=False, use_cache=True, deadline=None, **kwargs):
+    # http_client.get with retries; returns a usable response (404 included) or raises FetchError.
+    # With a deadline, no attempt waits or runs past it and no retry starts once it is spent.
+    attempts = MAX_ATTEMPTS if attempts is None else max(1, attempts)
+    if response_archive.replay_day():
+        # Archived answers never change, so a retry would only read the same record
+        attempts = 1
+    breaker = breaker_for(url)
+    problem = None
+
+    for attempt in range(attempts):
+        if attempt:
+            delay = backoff(attempt - 1)
+            if deadline is not None and deadline.remaining() - delay < deadlines.MIN_USEFUL_SECONDS:
+                raise DeadlineError(f"{url}: {deadline.label} deadline reached before retry {attempt} ({problem})")
+            print(f"🔁 Retry {attempt}/{attempts - 1} for {url} in {delay:.1f}s ({problem})")
+            telemetry.emit("retry", url=url, attempt=attempt, delay=round(delay, 3), reason=str(problem))
+            time.sleep(delay)
+
+        breaker.before()
+        try:
+            with telemetry.context(attempt=attempt):
+                res = http_client.get(
+                    url, rotate_user_agent=rotate_user_agent or attempt > 0, use_cache=use_cache and attempt == 0,
+                    deadline=deadline, **kwargs
+                )
+        except requests.RequestException as e:
+            problem = type(e).__name__
+            breaker.failure()
+            continue
+        except deadlines.DeadlineExceeded as e:
+            if deadline is not None and deadline.expired():
+                breaker.abandon()
+                raise DeadlineError(f"{url}: {e}") from e
+            # Only this request's own budget ran out: the host is too slow, like a timeout
+            problem = "request deadline"
+            breaker.failure()
+            continue
+
+        kind = classify(res)
+        # A block through one proxy exit flags that address, not us: the next attempt leaves through another
+        if kind == "blocked" and proxy_pool.bench(getattr(res, "proxy_exit", None), url):
+            # Says nothing about the host either, but a half-open trial must be let go
+            breaker.abandon()
+            problem = f"block page ({res.status_code})"
+            continue
+        if kind == "blocked":
+            breaker.failure(blocked=True)
+            raise BlockedError(f"{url} answered with a block page ({res.status_code})")
+        if kind == "ok":
+            breaker.success()
+            return res
+
+        problem = res.status_code
+        wait = rate_control.retry_after_seconds(res.headers.get("Retry-After"))
+        if wait is not None and wait > MAX_RETRY_AFTER:
+            breaker.failure(open_for=wait)
+            raise FetchError(f"{url} asked us to come back in {wait:.0f}s")
+        # 429 means "slower", which the rate controller already handles; the host itself is up
+        if res.status_code == 429:
+            breaker.success()
+        else:
+            breaker.failure()
+
+    raise FetchError(f"{url} failed after {attempts} attempts ({problem})")
+
+
+def stats():
+    with _lock:
+        breakers = dict(_breakers)
+    return {host: b.snapshot() for host, b in breakers.items()}
+
+
+def print_stats():
+    troubled = {host: s for host, s in stats().items() if s["opened"] or s["blocked"]}
+    if not troubled:
+        return
+
+    print("\n🧯 Circuit breakers:")
+    for host, s in sorted(troubled.items()):
+        state = "open" if s["open"] else "closed"
+        print(f"  {host:<20} {state:<6} opened {s['opened']}x  {s['blocked']} block pages  {s['rejected']} requests refused")
@@ -0,0 +1,149 @@
+import os
+import json
+import gzip
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import zstandard
+    CODEC = "zstd"
+except ImportError:
+    zstandard = None
+    CODEC = "gzip"
+
+# Raw responses land in <ARCHIVE_DIR>/<day>/<host>.warc.<zst|gz> with a JSON Lines index beside it
+ARCHIVE_DIR = Path(os.environ.get("SCRAPER_ARCHIVE_DIR", "raw_archive"))
+ENABLED = os.environ.get("SCRAPER_ARCHIVE", "0") == "1"
+
+KEPT_HEADERS = ["Content-Type", "ETag", "Last-Modified", "X-WP-Total", "X-WP-TotalPages"]
+
+_lock = threading.Lock()
+_replay_day = None
+_replay_index = {}
+
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("archive was written with zstd but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _paths(day, host):
+    folder = ARCHIVE_DIR / day
+    suffix = "zst" if CODEC == "zstd" else "gz"
+    safe_host = host.replace(":", "_")
+    return folder, folder / f"{safe_host}.warc.{suffix}", folder / f"{safe_host}.idx.jsonl"
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+def record(url, host, response):
+    # Each record is its own compressed frame, so the index can point straight at it
+    if not ENABLED or _replay_day:
+        return
+
+    now = datetime.now()
+    header = {
+        "url": url,
+        "ts": now.isoformat(timespec="seconds"),
+        "status": response.status_code,
+        "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+    }
+    frame = _compress(json.dumps(header).encode("utf-8") + b"\n" + response.content, CODEC)
+
+    folder, data_path, index_path = _paths(now.date().isoformat(), host)
+    with _lock:
+        folder.mkdir(parents=True, exist_ok=True)
+        with open(data_path, "ab") as f:
+            offset = f.tell()
+            f.write(frame)
+        entry = {
+            "url": url,
+            "ts": header["ts"],
+            "status": response.status_code,
+            "file": data_path.name,
+            "offset": offset,
+            "length": len(frame),
+            "codec": CODEC,
+        }
+        with open(index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def start_replay(day):
+    # Loads every index for the day; the latest record per URL wins
+    global _replay_day, _replay_index
+    folder = ARCHIVE_DIR / day
+    index = {}
+    for index_path in sorted(folder.glob("*.idx.jsonl")):
+        with open(index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entry["path"] = folder / entry["file"]
+                index[entry["url"]] = entry
+
+    if not index:
+        raise FileNotFoundError(f"No archived responses for {day} in {folder}")
+
+    with _lock:
+        _replay_day = day
+        _replay_index = index
+    print(f"📼 Replaying {len(index)} archived responses from {day}")
+
+
+def stop_replay():
+    global _replay_day, _replay_index
+    with _lock:
+        _replay_day = None
+        _replay_index = {}
+
+
+def replay_day():
+    return _replay_day
+
+
+def replay_response(url):
+    entry = _replay_index.get(url)
+    response = requests.Response()
+    response.url = url
+
+    if entry is None:
+        response.status_code = 404
+        response._content = b""
+        return response
+
+    with open(entry["path"], "rb") as f:
+        f.seek(entry["offset"])
+        frame = f.read(entry["length"])
+    header, _, body = _decompress(frame, entry["codec"]).partition(b"\n")
+    header = json.loads(header)
+
+    response.status_code = header["status"]
+    response._content = body
+    response.headers = CaseInsensitiveDict(header.get("headers", {}))
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def archived_days():
+    if not ARCHIVE_DIR.exists():
+        return []
+    return sorted(p.name for p in ARCHIVE_DIR.iterdir() if p.is_dir())
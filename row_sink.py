@@ -0,0 +1,60 @@
+import os
+import csv
+from pathlib import Path
+
+# Rows buffered before each write to the partial file
+FLUSH_ROWS = int(os.environ.get("SCRAPER_FLUSH_ROWS", "200"))
+
+
+class CsvSink:
+    # Streams rows to <name>.part with a fixed header and renames it into place on commit(),
+    # so readers only ever see a finished file under the real name.
+    def __init__(self, path, columns, flush_rows=FLUSH_ROWS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_name(self.path.name + ".part")
+        self.flush_rows = max(1, flush_rows)
+        self.buffer = []
+        self.count = 0
+        self.file = open(self.tmp_path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=columns)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.buffer.append(row)
+        self.count += 1
+        if len(self.buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.writer.writerows(self.buffer)
+            self.buffer = []
+        self.file.flush()
+
+    def commit(self):
+        # Returns the final path, or None (and no file) when nothing was written
+        self.flush()
+        self.file.close()
+        if not self.count:
+            self.tmp_path.unlink()
+            return None
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        self.file.close()
+        try:
+            self.tmp_path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
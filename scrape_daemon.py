@@ -0,0 +1,239 @@
+import os
+import json
+import signal
+import argparse
+import importlib
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import http_cache
+import http_client
+import parse_pool
+import proxy_pool
+import rate_control
+import refresh_schedule
+import resilience
+import vendor_scraper
+from fingerprints import STATE_DIR
+from vendor_specs import SPECS
+
+# Hours between two scrapes of a vendor, unless its spec's "refresh" rule sets "interval_hours"
+INTERVAL_HOURS = float(os.environ.get("SCRAPER_DAEMON_INTERVAL_HOURS", "6"))
+
+# A failed vendor is tried again after this long instead of a full interval
+RETRY_MINUTES = float(os.environ.get("SCRAPER_DAEMON_RETRY_MINUTES", "30"))
+
+# Local status endpoint (GET /status on 127.0.0.1); 0 turns it off
+STATUS_PORT = int(os.environ.get("SCRAPER_DAEMON_PORT", "8790"))
+
+# Longest sleep between schedule checks, so clock changes and stop requests are noticed
+MAX_SLEEP_SECONDS = 300
+
+STATE_PATH = STATE_DIR / "daemon.json"
+
+
+def interval_for(name):
+    hours = SPECS.get(name, {}).get("refresh", {}).get("interval_hours", INTERVAL_HOURS)
+    return timedelta(hours=hours)
+
+
+def _load_state():
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class ScrapeDaemon:
+    # Stays resident and scrapes each vendor on its own interval. Vendors that come due
+    # together run as one batch; HTTP sessions, rate controllers, circuit breakers,
+    # compiled specs and the parse pool all stay warm from one batch to the next.
+    def __init__(self, modules, export_dir=vendor_scraper.EXPORT_DIR, normalize=True):
+        self.export_dir = export_dir
+        self.normalize = normalize
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.started = datetime.now()
+        self.cycles = 0
+
+        # A restart picks up where the last process left off instead of scraping everything at once
+        saved = _load_state()
+        self.vendors = {}
+        for name in modules:
+            last = saved.get(name, {})
+            entry = {
+                "state": "idle", "next_run": self.started, "last_start": None, "last_finish": None,
+                "last_ok": None, "last_rows": 0, "last_seconds": 0.0, "last_error": "", "last_partial": False,
+                "runs": 0, "failures": 0,
+            }
+            if last.get("last_finish"):
+                entry["last_finish"] = datetime.fromisoformat(last["last_finish"])
+                entry["last_ok"] = last.get("last_ok")
+                entry["last_partial"] = last.get("last_partial", False)
+                wait = self._wait_after(name, entry["last_ok"], entry["last_partial"])
+                entry["next_run"] = entry["last_finish"] + wait
+            self.vendors[name] = entry
+
+    def due(self, now=None):
+        now = now or datetime.now()
+        with self.lock:
+            return [name for name, v in self.vendors.items() if v["state"] == "idle" and v["next_run"] <= now]
+
+    def seconds_to_next(self):
+        with self.lock:
+            upcoming = min(v["next_run"] for v in self.vendors.values())
+        return min(MAX_SLEEP_SECONDS, max(1.0, (upcoming - datetime.now()).total_seconds()))
+
+    def run(self):
+        print(f"🛰 Scrape daemon watching {len(self.vendors)} vendors")
+        while not self.stopping.is_set():
+            due = self.due()
+            if due:
+                self.run_cycle(due)
+            else:
+                self.stopping.wait(self.seconds_to_next())
+        print("🛑 Scrape daemon stopped")
+
+    def stop(self):
+        if not self.stopping.is_set():
+            print("\n🛑 Stopping after the current cycle...")
+        self.stopping.set()
+
+    def run_cycle(self, due):
+        self.cycles += 1
+        print(f"\n⏰ Cycle {self.cycles}: {', '.join(due)}")
+        # Pages memoized in the last cycle would hide today's changes
+        http_cache.clear_memo()
+        with self.lock:
+            for name in due:
+                self.vendors[name].update(state="running", last_start=datetime.now())
+        try:
+            vendor_scraper.run_batch(due, self.export_dir, on_result=self._finished)
+        finally:
+            with self.lock:
+                for name in due:
+                    self.vendors[name]["state"] = "idle"
+            self._save_state()
+
+    def _finished(self, result):
+        name = result["module"]
+        now = datetime.now()
+        with self.lock:
+            v = self.vendors[name]
+            v.update(
+                state="idle", last_finish=now, last_ok=result["ok"], last_rows=result["rows"],
+                last_seconds=round(result["seconds"], 1), last_error=result["error"], last_partial=result["partial"],
+                runs=v["runs"] + 1,
+            )
+            if not result["ok"]:
+                v["failures"] += 1
+            v["next_run"] = now + self._wait_after(name, result["ok"], result["partial"])
+            print(f"🗓 {name}: next run at {v['next_run']:%Y-%m-%d %H:%M}")
+
+        if result["ok"] and self.normalize:
+            self._normalize()
+
+    def _wait_after(self, name, ok, partial):
+        # Failed and partial runs come back soon for what they missed; complete ones wait a full interval
+        return interval_for(name) if ok and not partial else timedelta(minutes=RETRY_MINUTES)
+
+    def _normalize(self):
+        # Keeps the combined CSV and the daily archive current after every vendor
+        try:
+            normalizer = importlib.import_module("normalize_scraped_data")
+        except ImportError as e:
+            print(f"⚠️ Normalization is off: {e}")
+            self.normalize = False
+            return
+        try:
+            normalizer.run_normalization()
+        except Exception as e:
+            print(f"❌ Normalization failed: {e}")
+            return
+        refresh_schedule.reload_history()
+
+    def _save_state(self):
+        with self.lock:
+            state = {
+                name: {
+                    "last_finish": v["last_finish"].isoformat(timespec="seconds"),
+                    "last_ok": v["last_ok"], "last_partial": v["last_partial"],
+                }
+                for name, v in self.vendors.items()
+                if v["last_finish"]
+            }
+        STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_PATH.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp, STATE_PATH)
+
+    def status(self):
+        with self.lock:
+            vendors = {
+                name: {k: value.isoformat(timespec="seconds") if isinstance(value, datetime) else value for k, value in v.items()}
+                for name, v in self.vendors.items()
+            }
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "uptime_seconds": round((datetime.now() - self.started).total_seconds()),
+            "cycles": self.cycles,
+            "stopping": self.stopping.is_set(),
+            "vendors": vendors,
+            "http": http_client.stats(),
+            "rate": rate_control.stats(),
+            "breakers": resilience.stats(),
+            "proxies": proxy_pool.stats(),
+        }
+
+
+def serve_status(daemon, port=STATUS_PORT):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/status"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps(daemon.status(), indent=1, default=str).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📡 Status at http://127.0.0.1:{server.server_address[1]}/status")
+    return server
+
+
+def run_daemon(modules=None, port=STATUS_PORT, normalize=True):
+    daemon = ScrapeDaemon(modules or vendor_scraper.vendor_modules, normalize=normalize)
+    server = serve_status(daemon, port) if port else None
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: daemon.stop())
+    try:
+        daemon.run()
+    finally:
+        if server:
+            server.shutdown()
+        parse_pool.shutdown()
+        http_client.close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep scraping vendors on their own intervals")
+    parser.add_argument("vendors", nargs="*", help="vendors to schedule (default: all)")
+    parser.add_argument("--port", type=int, default=STATUS_PORT, help="status endpoint port (0 turns it off)")
+    parser.add_argument("--no-normalize", action="store_true", help="do not normalize after each vendor")
+    args = parser.parse_args()
+    run_daemon(args.vendors or None, args.port, not args.no_normalize)
+
+
+if __name__ == "__main__":
+    main()
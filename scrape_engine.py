@@ -0,0 +1,498 @@
+import collections
+import copy
+import json
+import time
+from datetime import date
+from pathlib import Path
+
+import soupsieve
+
+import browser_session
+import checkpoints
+import deadlines
+import fingerprints
+import html_parsing
+import http_client
+import pagination
+import parse_pool
+import proxy_pool
+import response_archive
+import rate_control
+import refresh_schedule
+import resilience
+import row_sink
+import stock_checks
+import store_api
+import telemetry
+from vendor_specs import SPECS
+
+PLATFORMS = {
+    "magento": (pagination.magento_page_count, pagination.MAGENTO_PAGER_CLASSES),
+    "woocommerce": (pagination.woocommerce_page_count, pagination.WOOCOMMERCE_PAGER_CLASSES),
+    "microless": (pagination.microless_page_count, pagination.MICROLESS_PAGER_CLASSES),
+    "opencart": (pagination.opencart_page_count, pagination.OPENCART_PAGER_CLASSES),
+}
+
+# Statuses a challenge-protected site answers with when it does not accept the session
+REJECTED_STATUSES = {401, 403, 503}
+
+PRODUCT_PAGE_CLASSES = {
+    "instock_label": ["instock-lable", "quantity-selector"],
+    # The out-of-stock badge is matched through a sibling selector, so that page is parsed whole
+    "out_of_stock_badge": None,
+}
+
+QTY_SELECTOR = soupsieve.compile("div.quantity-selector select[name='quantity']")
+INSTOCK_LABEL = soupsieve.compile("div.instock-lable")
+OUT_OF_STOCK_BADGE = soupsieve.compile(".product-price + .bottom .out-of-stock")
+
+_compiled = {}
+
+
+def compile_spec(name, spec=None):
+    # Parse processes pass the raw spec along, since they do not share the parent's SPECS
+    if name in _compiled:
+        return _compiled[name]
+
+    spec = spec or SPECS[name]
+    fields = {}
+    for column, rule in spec["fields"].items():
+        rule = dict(rule)
+        selectors = rule.get("select")
+        if isinstance(selectors, str):
+            selectors = [selectors]
+        rule["compiled"] = [soupsieve.compile(s) for s in selectors or []]
+        fields[column] = rule
+
+    count_pages, pager_classes = PLATFORMS[spec["platform"]]
+    compiled = {
+        **spec,
+        "name": name,
+        "export_name": spec.get("export_name", name),
+        "compiled_fields": fields,
+        "compiled_container": soupsieve.compile(spec["container"]),
+        "count_pages": count_pages,
+        "listing_classes": [spec["container_class"]] + pager_classes,
+    }
+    rate_control.declare(spec["base_url"], **spec.get("rate", {}))
+    proxy_pool.declare(spec["base_url"], **spec.get("proxy", {}))
+    _compiled[name] = compiled
+    return compiled
+
+
+def run_date():
+    # A replayed day keeps its own date in the rows and file name
+    return response_archive.replay_day() or date.today().isoformat()
+
+
+def page_url(spec, page, page_size=None):
+    category = spec["category_path"]
+    path = category if page == 1 else spec["page_template"].format(category=category, page=page)
+    url = f"{spec['base_url']}{'/' if not path.startswith('/') else ''}{path}"
+    if page_size:
+        url += f"{'&' if '?' in url else '?'}{spec['page_size']['param']}={page_size}"
+    return url
+
+
+def magento_page_size(spec, deadline=None):
+    # Magento categories offer a few page sizes in the toolbar. Page 1 at the default size
+    # lists them; returns the largest when it means fewer pages, else None. With the HTTP
+    # cache on, a listing that keeps the default size gets that page 1 from memory.
+    url = page_url(spec, 1)
+    try:
+        res = resilience.fetch(
+            url,
+            attempts=spec.get("listing_retries"),
+            headers=spec.get("headers"),
+            rotate_user_agent=spec.get("rotate_user_agent", False),
+            deadline=deadline,
+        )
+    except resilience.FetchError as e:
+        print(f"⚠️ {spec['name']}: could not read page sizes ({e})")
+        return None
+    if res.status_code != 200:
+        return None
+
+    soup = html_parsing.make_soup(res.content, pagination.MAGENTO_LIMITER_CLASSES + pagination.MAGENTO_PAGER_CLASSES)
+    sizes, current = pagination.magento_page_sizes(soup)
+    if not sizes or max(sizes) <= (current or 0) or (pagination.magento_page_count(soup) or 1) <= 1:
+        return None
+    return max(sizes)
+
+
+def _clean(text, rule):
+    text = text.strip()
+    for fragment in rule.get("remove", []):
+        text = text.replace(fragment, "")
+    return text.strip()
+
+
+def _field(spec, rule, container, day=None):
+    if "value" in rule:
+        return (day or run_date()) if rule["value"] == "today" else rule["value"]
+
+    tag = None
+    for selector in rule["compiled"]:
+        tag = selector.select_one(container)
+        if tag is not None:
+            break
+
+    if "present" in rule:
+        return rule["present"] if tag is not None else rule["absent"]
+    if tag is None:
+        return None
+
+    value = tag[rule["attr"]].strip() if rule.get("attr") else _clean(tag.text, rule)
+    if rule.get("absolute") and not value.startswith("http"):
+        value = spec["base_url"] + value
+    if rule.get("number"):
+        value = float(value) if value.replace(".", "", 1).isdigit() else ""
+    return value
+
+
+def parse_item(spec, container, day=None):
+    row = {}
+    for column in spec["columns"]:
+        rule = spec["compiled_fields"][column]
+        value = _field(spec, rule, container, day)
+        if value is None:
+            if rule.get("required"):
+                return None
+            value = rule.get("default", "")
+        row[column] = value
+
+    for column in spec["columns"]:
+        rule = spec["compiled_fields"][column]
+        if "fallback" in rule and not row[column]:
+            row[column] = row[rule["fallback"]]
+    return row
+
+
+def _parse_item_safely(spec, container, day=None):
+    try:
+        return parse_item(spec, container, day)
+    except Exception as e:
+        print(f"❌ Error parsing product: {e}")
+        return None
+
+
+def parse_listing(name, raw_spec, content, day):
+    # Runs in a parse process: returns (page count, rows) so nothing unpicklable crosses back
+    spec = compile_spec(name, raw_spec)
+    if spec.get("json_field"):
+        try:
+            content = json.loads(content).get(spec["json_field"]) or ""
+        except (ValueError, AttributeError):
+            print(f"❌ {name}: listing response is not the expected JSON")
+            return None, []
+
+    soup, items = html_parsing.listing_items(
+        content,
+        spec["listing_classes"],
+        spec["compiled_container"].select,
+        lambda c: _parse_item_safely(spec, c, day),
+        name,
+    )
+
+    total = None
+    if items:
+        try:
+            total = spec["count_pages"](soup)
+        except Exception as e:
+            print(f"⚠️ Could not read page count: {e}")
+    return total, [row for row in (_parse_item_safely(spec, c, day) for c in items) if row]
+
+
+def fetch_listing(spec, url, failed=None, api=False, deadline=None, response=None):
+    # Runs on pagination worker threads, so the vendor is tagged here for telemetry.
+    # A response already fetched for url (the session probe's page 1) is parsed as is.
+    with telemetry.context(vendor=spec["name"], phase="listing"):
+        return _fetch_listing(spec, url, failed, api, deadline or deadlines.for_vendor(), response)
+
+
+def _fetch_listing(spec, url, failed, api, vendor, res):
+    if res is not None:
+        print(f"🔄 Scraping page: {url} (from the session check)")
+    # Once the vendor is out of time the remaining pages are dropped, not fetched late
+    elif vendor.expired():
+        print(f"⏱ Skipping page: {url} ({vendor.label} deadline reached)")
+        vendor.skip()
+        if failed is not None:
+            failed.append(url)
+        return None, []
+    else:
+        print(f"🔄 Scraping page: {url}")
+        try:
+            res = resilience.fetch(
+                url,
+                attempts=spec.get("listing_retries"),
+                headers=store_api.JSON_HEADERS if api else spec.get("headers"),
+                rotate_user_agent=spec.get("rotate_user_agent", False),
+                deadline=vendor.child(deadlines.PAGE_SECONDS, "page"),
+            )
+        except resilience.FetchError as e:
+            print(f"❌ Error fetching page: {e}")
+            if isinstance(e, resilience.DeadlineError) and vendor.expired():
+                vendor.skip()
+            if failed is not None:
+                failed.append(url)
+            return None, []
+
+    if res.status_code == 404:
+        return None, []
+    with telemetry.timed("parse", url=url) as parsed:
+        if api:
+            total, rows = store_api.parse_page(spec, res, run_date())
+        else:
+            total, rows = parse_pool.run(parse_listing, spec["name"], SPECS[spec["name"]], res.content, run_date())
+        parsed["products"] = len(rows)
+    return total, rows
+
+
+def rejected(spec, res):
+    if res.status_code in REJECTED_STATUSES or resilience.is_block_page(res):
+        return True
+    if spec.get("json_field") and res.status_code == 200:
+        try:
+            json.loads(res.content)
+        except ValueError:
+            return True
+    return False
+
+
+def open_session(spec, deadline=None):
+    # Loads the vendor's stored browser cookies and checks them on page 1; a browser
+    # is launched to renew them only when the site rejects the stored ones. Returns the
+    # accepted page 1 response, so the listing does not fetch it a second time.
+    rule = spec.get("session")
+    if not rule or response_archive.replay_day():
+        return None
+    deadline = deadline or deadlines.for_vendor()
+
+    http_client.set_cookies(spec["base_url"], browser_session.load_cookies(rule["cookies_file"]))
+    probe_url = page_url(spec, 1)
+    res = http_client.get(probe_url, headers=spec.get("headers"), use_cache=False, deadline=deadline)
+    if not rejected(spec, res):
+        return res
+
+    print(f"🍪 {spec['name']}: stored cookies rejected ({res.status_code}), renewing them in a browser")
+    deadline.check("the browser could start")
+    cookies = browser_session.harvest_cookies(
+        rule["browser_url"], spec["headers"]["User-Agent"], rule["ready_selector"],
+        timeout=min(browser_session.CHALLENGE_TIMEOUT, deadline.remaining()),
+        proxy=proxy_pool.browser_proxy(spec["base_url"]),
+    )
+    browser_session.save_cookies(rule["cookies_file"], cookies)
+    http_client.set_cookies(spec["base_url"], cookies)
+
+    res = http_client.get(probe_url, headers=spec.get("headers"), use_cache=False, deadline=deadline)
+    if rejected(spec, res):
+        raise RuntimeError(f"{spec['name']}: still rejected ({res.status_code}) with fresh browser cookies")
+    return res
+
+
+def _max_qty(soup):
+    qty_selector = QTY_SELECTOR.select_one(soup)
+    if qty_selector:
+        options = qty_selector.find_all("option")
+        return options[-1].text.strip() if options else "Not listed"
+    return "Not listed"
+
+
+def read_stock(page_rule, soup):
+    if page_rule == "out_of_stock_badge":
+        stock_status = "Out of stock" if OUT_OF_STOCK_BADGE.select_one(soup) else "In stock"
+    else:
+        stock_div = INSTOCK_LABEL.select_one(soup)
+        stock_status = stock_div.text.strip() if stock_div else "Unknown"
+    return stock_status, _max_qty(soup)
+
+
+def parse_stock_page(page_rule, content):
+    return read_stock(page_rule, html_parsing.make_soup(content, PRODUCT_PAGE_CLASSES[page_rule]))
+
+
+def check_stock_page(spec, url, deadline=None):
+    with telemetry.context(vendor=spec["name"], phase="stock"):
+        return _check_stock_page(spec, url, deadline or deadlines.for_vendor())
+
+
+def _check_stock_page(spec, url, vendor):
+    rule = spec["stock_check"]
+    for attempt in range(rule.get("retries", 1)):
+        if vendor.expired():
+            print(f"⏱ Skipping stock check: {url} ({vendor.label} deadline reached)")
+            vendor.skip()
+            break
+        if attempt:
+            print(f"🔁 Retry {attempt}/{rule['retries'] - 1} for {url}")
+            time.sleep(min(resilience.backoff(attempt - 1), vendor.remaining()))
+        try:
+            res = resilience.fetch(
+                url, attempts=1, rotate_user_agent=attempt > 0, use_cache=attempt == 0,
+                deadline=vendor.child(deadlines.PAGE_SECONDS, "page"),
+            )
+            with telemetry.timed("parse", url=url):
+                stock_status, max_qty = parse_pool.run(parse_stock_page, rule["page"], res.content)
+            if stock_status != "Unknown" or max_qty != "Not listed":
+                return stock_status, max_qty
+        except (resilience.BlockedError, resilience.CircuitOpenError, resilience.DeadlineError) as e:
+            print(f"❌ Giving up on stock info for: {url} — {e}")
+            break
+        except Exception as e:
+            print(f"❌ Error scraping stock info for: {url} — {e}")
+    return "Unknown", "Not listed"
+
+
+def _check_and_record(spec, checkpoint, url, deadline):
+    result = check_stock_page(spec, url, deadline)
+    if result != ("Unknown", "Not listed"):
+        checkpoint.resolve(url, result)
+    return result
+
+
+def wants_stock_check(spec, row):
+    rule = spec.get("stock_check")
+    if not rule:
+        return False
+    if rule["when"] == "title_contains":
+        return any(term in row["Product Name"] for term in rule["terms"])
+
+    price = str(row.get(rule["price_field"], ""))
+    price_val = float(price) if price.replace(".", "", 1).isdigit() else 0
+    return stock_checks.needs_check(price_val)
+
+
+def export_path(spec, export_dir):
+    return Path(export_dir) / f"{spec['export_name']}_{run_date()}.csv"
+
+
+def scrape_vendor(name, export_dir, replay=None, deadline=None, failed=None):
+    # deadline bounds the whole vendor; work it cannot fit is skipped and the output marked partial.
+    # Listing pages that could not be fetched are appended to `failed`.
+    if replay and response_archive.replay_day() != replay:
+        response_archive.start_replay(replay)
+    replaying = bool(response_archive.replay_day())
+    vendor = deadline or deadlines.for_vendor()
+
+    spec = compile_spec(name)
+    probe = open_session(spec, vendor)
+    # WooCommerce shops with the Store API enabled are listed from JSON, 100 products a request
+    category = store_api.find_category(spec, vendor.child(deadlines.PAGE_SECONDS, "page")) if spec.get("store_api") else None
+    api = category is not None
+    page_size = (
+        magento_page_size(spec, vendor.child(deadlines.PAGE_SECONDS, "page")) if spec.get("page_size") and not api else None
+    )
+    if api:
+        variant = "store_api"
+        print(f"🧾 {name}: listing category {category} through the Store API")
+    elif page_size:
+        variant = f"limit{page_size}"
+        print(f"🧾 {name}: listing {page_size} products per page")
+    else:
+        variant = None
+    # Pages of differently sized listings do not line up, so each keeps its own checkpoint
+    checkpoint = checkpoints.Checkpoint(
+        f"{name}.{variant}" if variant else name, enabled=checkpoints.ENABLED and not replaying
+    )
+    # Every proxy exit adds its own share of workers and request rate
+    exits = 1 if replaying else proxy_pool.exit_count(spec["base_url"])
+    checker = None
+    if spec.get("stock_check"):
+        checker = stock_checks.StockChecker(
+            lambda url: _check_and_record(spec, checkpoint, url, vendor),
+            workers=stock_checks.STOCK_WORKERS * exits,
+            per_second=0 if replaying else stock_checks.STOCK_REQUESTS_PER_SECOND * exits,
+            deadline=vendor,
+        )
+    index = fingerprints.FingerprintIndex(name, enabled=not replaying) if checker else None
+    # Replays must make the same checks as the archived run, so they keep the spec's rules
+    plan = refresh_schedule.plan_for(name) if checker and not replaying else None
+    checked = set()
+    failed = [] if failed is None else failed
+
+    # Pages wait in `held` until no lower page can still arrive, then their rows queue
+    # in order and are written as soon as their stock checks are done.
+    held = dict(checkpoint.pages)
+    queue = collections.deque()
+
+    def resolve_stock(row):
+        if not checker:
+            return
+        if plan is not None:
+            if not plan.wants(spec, row, index, wants_stock_check(spec, row)):
+                return
+        elif not wants_stock_check(spec, row) or index.carry_forward(row):
+            return
+        url = row["Product URL"]
+        checked.add(id(row))
+        if url in checkpoint.resolved:
+            row["Stock Status"], row["Available Qty"] = checkpoint.resolved[url]
+        else:
+            checker.submit(row, url, row["Product Name"])
+
+    def release(up_to=None):
+        for page in sorted(held):
+            if up_to is not None and page > up_to:
+                break
+            queue.extend(held.pop(page))
+
+    def drain(sink):
+        while queue and (not checker or checker.done(queue[0])):
+            row = queue.popleft()
+            if id(row) in checked:
+                checker.fill(row)
+                checked.discard(id(row))
+                if row["Stock Status"] != "Unknown" or row["Available Qty"] != "Not listed":
+                    index.record(row)
+            sink.write(row)
+
+    for page_rows in held.values():
+        for row in page_rows:
+            resolve_stock(row)
+
+    state = copy.deepcopy(checkpoint.pagination)
+    # The session check already fetched the plain page 1; it stands in for the listing's own
+    first_page = {page_url(spec, 1): probe} if probe is not None and probe.status_code == 200 else {}
+    with row_sink.CsvSink(export_path(spec, export_dir), spec["columns"]) as sink:
+        # Listings come back already parsed, with the page count standing in for the soup
+        for page, page_rows in pagination.iter_pages(
+            lambda n: store_api.page_url(spec, category, n) if api else page_url(spec, n, page_size),
+            lambda url: fetch_listing(spec, url, failed, api, vendor, first_page.pop(url, None)),
+            lambda total: total,
+            workers=pagination.PAGE_WORKERS * exits,
+            skip=checkpoint.pages.keys(),
+            state=state,
+        ):
+            checkpoint.save_pagination(state)
+            checkpoint.page_done(page, page_rows)
+            for row in page_rows:
+                resolve_stock(row)
+            held[page] = page_rows
+            release(up_to=page)
+            drain(sink)
+
+        print("✅ No more products found.")
+        release()
+        if checker:
+            checker.join()
+        drain(sink)
+
+    if index:
+        index.save()
+
+    if sink.count:
+        print(f"\n✅ Saved {sink.count} {spec['label']} products to {sink.path}")
+    else:
+        print(f"⚠️ No {spec['label']} products scraped.")
+
+    if vendor.skipped:
+        print(f"⏱ {name}: {vendor.label} deadline reached, {vendor.skipped} pages or checks skipped; output is partial")
+        telemetry.emit("deadline", vendor=name, level=vendor.label, skipped=vendor.skipped)
+    if failed and not sink.count:
+        raise resilience.FetchError(f"{name}: every listing page failed ({len(failed)} pages)")
+    if failed:
+        print(f"⚠️ {len(failed)} listing pages failed; rerun today to fetch only the missing pages")
+    else:
+        checkpoint.clear()
+    return sink.count
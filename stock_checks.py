@@ -0,0 +1,99 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import deadlines
+
+# Only products priced above this get a product-page stock check (AED, 0 checks everything)
+STOCK_CHECK_MIN_PRICE = float(os.environ.get("SCRAPER_STOCK_MIN_PRICE", "1000"))
+
+# Product pages resolved at once, and how many may start per second
+STOCK_WORKERS = int(os.environ.get("SCRAPER_STOCK_WORKERS", "4"))
+STOCK_REQUESTS_PER_SECOND = float(os.environ.get("SCRAPER_STOCK_RPS", "2"))
+
+
+def needs_check(price_val, min_price=None):
+    threshold = STOCK_CHECK_MIN_PRICE if min_price is None else min_price
+    return price_val > threshold
+
+
+class RateLimiter:
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self, deadline=None):
+        # Sleeps until the next free slot; returns False without taking one when that slot
+        # leaves no useful time before deadline
+        if not self.interval:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            if deadline is not None and deadline.end - slot < deadlines.MIN_USEFUL_SECONDS:
+                return False
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+        return True
+
+
+class StockChecker:
+    # Listing parsing submits rows as it goes; a bounded pool resolves
+    # "Stock Status"/"Available Qty" from product pages. fill() copies one finished
+    # result into its row, join() waits for and fills whatever is left. Checks whose turn
+    # comes after `deadline` are skipped as soon as they reach a worker.
+    def __init__(self, check_page, workers=STOCK_WORKERS, per_second=STOCK_REQUESTS_PER_SECOND, deadline=None):
+        self.check_page = check_page
+        self.limiter = RateLimiter(per_second)
+        self.deadline = deadline
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.pending = {}
+        self.resolved = 0
+
+    def _check(self, url):
+        if not self.limiter.wait(self.deadline):
+            print(f"⏱ Skipping stock check: {url} ({self.deadline.label} deadline reached)")
+            self.deadline.skip()
+            return "Unknown", "Not listed"
+        return self.check_page(url)
+
+    def submit(self, row, url, label=""):
+        print(f"🟡 Queued stock check for: {label or url}")
+        self.pending[id(row)] = (row, self.pool.submit(self._check, url))
+
+    def done(self, row):
+        # True when the row has no stock check still running
+        entry = self.pending.get(id(row))
+        return entry is None or entry[1].done()
+
+    def fill(self, row):
+        entry = self.pending.pop(id(row), None)
+        if entry is None:
+            return
+        try:
+            stock_status, max_qty = entry[1].result()
+        except Exception as e:
+            print(f"❌ Stock check failed for {row.get('Product URL', '')}: {e}")
+            stock_status, max_qty = "Unknown", "Not listed"
+        row["Stock Status"] = stock_status
+        row["Available Qty"] = max_qty
+        self.resolved += 1
+
+    def join(self):
+        for row, _ in list(self.pending.values()):
+            self.fill(row)
+
+        self.pool.shutdown(wait=True)
+        if self.resolved:
+            print(f"📦 Resolved stock for {self.resolved} products")
+        self.resolved = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.join()
+        return False
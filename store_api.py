@@ -0,0 +1,118 @@
+import html
+import json
+from decimal import Decimal
+
+import pagination
+import resilience
+
+# WooCommerce Store API: the public JSON behind the block-based shop pages. One request
+# returns up to 100 products with prices and stock, instead of a rendered page of ~12-24.
+PRODUCTS_PATH = "/wp-json/wc/store/v1/products"
+CATEGORIES_PATH = "/wp-json/wc/store/v1/products/categories"
+PER_PAGE = 100
+
+# add_to_cart.maximum is capped at this when the shop does not track a product's stock
+UNLIMITED_QTY = 9999
+
+JSON_HEADERS = {"Accept": "application/json"}
+
+
+def category_slug(spec):
+    # The last segment of category_path, e.g. /product-category/vga-card/ -> vga-card
+    return spec["store_api"].get("category") or spec["category_path"].rstrip("/").rsplit("/", 1)[-1]
+
+
+def find_category(spec, deadline=None):
+    # Store API category id for the spec's category, or None when the endpoint is disabled,
+    # blocked or does not know the category (the caller then scrapes the HTML listing)
+    url = spec["base_url"] + CATEGORIES_PATH
+    try:
+        res = resilience.fetch(url, attempts=spec.get("listing_retries"), headers=JSON_HEADERS, deadline=deadline)
+    except resilience.FetchError as e:
+        print(f"⚠️ {spec['name']}: Store API unavailable ({e}), using the HTML listing")
+        return None
+
+    try:
+        categories = json.loads(res.content) if res.status_code == 200 else None
+    except ValueError:
+        categories = None
+    if not isinstance(categories, list):
+        print(f"⚠️ {spec['name']}: Store API disabled ({res.status_code}), using the HTML listing")
+        return None
+
+    slug = category_slug(spec)
+    for category in categories:
+        if isinstance(category, dict) and category.get("slug") == slug:
+            return category["id"]
+    print(f"⚠️ {spec['name']}: Store API has no category '{slug}', using the HTML listing")
+    return None
+
+
+def page_url(spec, category, page):
+    return f"{spec['base_url']}{PRODUCTS_PATH}?category={category}&per_page={PER_PAGE}&page={page}"
+
+
+def _amount(value, prices):
+    # Prices come as integer strings in minor units: "149900" with 2 digits is 1499.00
+    if value in (None, ""):
+        return ""
+    digits = int(prices.get("currency_minor_unit", 2))
+    return f"{Decimal(int(value)).scaleb(-digits):.{digits}f}"
+
+
+def product_values(product, day):
+    # Everything a "store_api" field rule can name, for one product
+    prices = product.get("prices") or {}
+    price = _amount(prices.get("price") or (prices.get("price_range") or {}).get("min_amount"), prices)
+    regular = _amount(prices.get("regular_price"), prices) or price
+
+    discount = ""
+    if product.get("on_sale") and price and Decimal(regular) > Decimal(price) > 0:
+        discount = f"-{round(100 * (1 - Decimal(price) / Decimal(regular)))}%"
+
+    if product.get("is_on_backorder"):
+        stock = "On backorder"
+    else:
+        stock = "In stock" if product.get("is_in_stock") else "Out of stock"
+
+    quantity = None
+    if stock == "In stock":
+        maximum = (product.get("add_to_cart") or {}).get("maximum")
+        quantity = product.get("low_stock_remaining") or (maximum if maximum and maximum < UNLIMITED_QTY else None)
+
+    return {
+        "today": day,
+        "name": html.unescape(product.get("name", "")).strip(),
+        "price": price,
+        "regular_price": regular,
+        "sale_price": _amount(prices.get("sale_price"), prices),
+        "discount": discount,
+        "stock": stock,
+        "quantity": "" if quantity is None else quantity,
+        "sku": product.get("sku", ""),
+        "permalink": product["permalink"],
+    }
+
+
+def parse_page(spec, response, day):
+    # (page count, rows) for one products response; the count comes from X-WP-TotalPages
+    try:
+        products = json.loads(response.content)
+    except ValueError:
+        products = None
+    if not isinstance(products, list):
+        print(f"❌ {spec['name']}: Store API page is not a product list ({response.status_code})")
+        return None, []
+
+    fields = spec["store_api"]["fields"]
+    rows = []
+    for product in products:
+        try:
+            values = product_values(product, day)
+        except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+            print(f"❌ Error parsing product: {e}")
+            continue
+        rows.append({column: values.get(fields.get(column), "") for column in spec["columns"]})
+
+    total = response.headers.get("X-WP-TotalPages", "")
+    return (pagination.ExactCount(total) if total.isdigit() else None), rows
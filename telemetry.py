@@ -0,0 +1,232 @@
+import os
+import json
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import http_client
+from fingerprints import STATE_DIR
+
+# One JSON Lines file per orchestrated run; set SCRAPER_TELEMETRY=0 to turn it off
+TELEMETRY_DIR = Path(os.environ.get("SCRAPER_TELEMETRY_DIR", STATE_DIR / "telemetry"))
+ENABLED = os.environ.get("SCRAPER_TELEMETRY", "1") != "0"
+
+# Events buffered before a write; the file is also flushed when the run ends
+FLUSH_EVENTS = 200
+
+# A vendor counts as regressed when it is this much slower and at least MIN_REGRESSION_SECONDS slower
+REGRESSION_RATIO = 1.25
+MIN_REGRESSION_SECONDS = 5.0
+
+_local = threading.local()
+_lock = threading.Lock()
+_run = None
+
+
+def start_run(**fields):
+    # Opens a new run file and starts recording every network request
+    global _run
+    if not ENABLED:
+        return None
+    TELEMETRY_DIR.mkdir(parents=True, exist_ok=True)
+    run_id = datetime.now().strftime("run-%Y%m%d-%H%M%S")
+    path = TELEMETRY_DIR / f"{run_id}.jsonl"
+    with _lock:
+        _run = {"path": path, "file": open(path, "a", encoding="utf-8"), "buffer": [], "start": time.monotonic()}
+    http_client.add_observer(_observe_request)
+    emit("run_start", run=run_id, **fields)
+    return path
+
+
+def finish_run(**fields):
+    global _run
+    if _run is None:
+        return None
+    emit("run_end", seconds=round(time.monotonic() - _run["start"], 3), **fields)
+    http_client.remove_observer(_observe_request)
+    with _lock:
+        run, _run = _run, None
+        _flush(run)
+        run["file"].close()
+    return run["path"]
+
+
+def _flush(run):
+    if run["buffer"]:
+        run["file"].write("".join(run["buffer"]))
+        run["buffer"] = []
+    run["file"].flush()
+
+
+def emit(event, **fields):
+    if _run is None:
+        return
+    record = {"ev": event, "ts": round(time.time(), 3)}
+    record.update(getattr(_local, "context", {}))
+    record.update(fields)
+    line = json.dumps(record) + "\n"
+    with _lock:
+        if _run is None:
+            return
+        _run["buffer"].append(line)
+        if len(_run["buffer"]) >= FLUSH_EVENTS:
+            _flush(_run)
+
+
+@contextmanager
+def context(**fields):
+    # Tags every event emitted on this thread (vendor, phase, attempt, ...) until the block ends
+    previous = getattr(_local, "context", {})
+    _local.context = {**previous, **fields}
+    try:
+        yield
+    finally:
+        _local.context = previous
+
+
+@contextmanager
+def timed(event, **fields):
+    # Emits event with its duration in "seconds"; the block can add fields to the yielded dict
+    extra = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        emit(event, seconds=round(time.perf_counter() - start, 4), **extra)
+
+
+def _observe_request(url, status, latency, size, waited):
+    emit(
+        "request",
+        url=url,
+        host=http_client.host_of(url),
+        status=status,
+        bytes=size,
+        latency=round(latency, 4),
+        waited=round(waited or 0.0, 4),
+    )
+
+
+def list_runs():
+    return sorted(TELEMETRY_DIR.glob("run-*.jsonl")) if TELEMETRY_DIR.exists() else []
+
+
+def load_events(path):
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
+
+
+def summarize(events):
+    # Per-vendor totals; network/parse/sleep are summed across threads, so they can exceed wall time
+    vendors = {}
+    requests_seen = []
+
+    def vendor(name):
+        return vendors.setdefault(name or "-", {
+            "wall": 0.0, "network": 0.0, "parse": 0.0, "sleep": 0.0,
+            "requests": 0, "errors": 0, "retries": 0, "bytes": 0, "products": 0, "ok": None,
+        })
+
+    for e in events:
+        v = vendor(e.get("vendor"))
+        kind = e["ev"]
+        if kind == "request":
+            v["requests"] += 1
+            v["network"] += e["latency"]
+            v["sleep"] += e.get("waited", 0.0)
+            v["bytes"] += e.get("bytes", 0)
+            if e["status"] is None or e["status"] >= 400:
+                v["errors"] += 1
+            requests_seen.append(e)
+        elif kind == "retry":
+            v["retries"] += 1
+            v["sleep"] += e.get("delay", 0.0)
+        elif kind == "parse":
+            v["parse"] += e["seconds"]
+        elif kind == "vendor":
+            v["wall"] = e["seconds"]
+            v["products"] = e.get("rows", 0)
+            v["ok"] = e.get("ok")
+            v["partial"] = e.get("partial", False)
+
+    # Events outside any vendor (run start/end) leave an empty "-" entry behind
+    unattributed = vendors.get("-")
+    if unattributed and not unattributed["requests"]:
+        del vendors["-"]
+    slowest = sorted(requests_seen, key=lambda e: e["latency"], reverse=True)
+    return vendors, slowest
+
+
+def print_report(path, previous=None, top=10):
+    vendors, slowest = summarize(load_events(path))
+    print(f"\n📈 Run report: {path.name}")
+    print(f"  {'vendor':<26} {'wall':>8} {'network':>8} {'parse':>7} {'sleep':>7} {'reqs':>5} {'err%':>5} {'retry':>5} {'rows':>6}")
+    for name, v in sorted(vendors.items(), key=lambda kv: kv[1]["wall"], reverse=True):
+        error_rate = 100.0 * v["errors"] / v["requests"] if v["requests"] else 0.0
+        status = "❌" if v["ok"] is False else "⏱" if v.get("partial") else " "
+        print(
+            f"{status} {name:<26} {v['wall']:7.1f}s {v['network']:7.1f}s {v['parse']:6.1f}s {v['sleep']:6.1f}s"
+            f" {v['requests']:5d} {error_rate:5.1f} {v['retries']:5d} {v['products']:6d}"
+        )
+
+    if slowest:
+        print(f"\n🐌 Slowest {min(top, len(slowest))} requests:")
+        for e in slowest[:top]:
+            print(f"  {e['latency']:6.2f}s  {e['status']}  {e.get('vendor', '-'):<22} {e['url']}")
+
+    if previous is None:
+        return
+    before, _ = summarize(load_events(previous))
+    regressions = [
+        (name, before[name]["wall"], v["wall"])
+        for name, v in vendors.items()
+        if name in before and before[name]["wall"]
+        and v["wall"] > before[name]["wall"] * REGRESSION_RATIO
+        and v["wall"] - before[name]["wall"] >= MIN_REGRESSION_SECONDS
+    ]
+    print(f"\n🔍 Compared with {previous.name}:")
+    if not regressions:
+        print("  no vendor got slower")
+    for name, old, new in regressions:
+        print(f"  ⚠️ {name}: {old:.1f}s → {new:.1f}s ({new / old:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape telemetry")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="summarize a run (default: the latest)")
+    report.add_argument("run", nargs="?", help="run file or id, e.g. run-20250525-163311")
+    report.add_argument("--top", type=int, default=10, help="slowest requests to list")
+    sub.add_parser("runs", help="list recorded runs")
+    args = parser.parse_args()
+
+    runs = list_runs()
+    if args.command == "runs":
+        for path in runs:
+            print(path.name)
+        return
+
+    if not runs:
+        print(f"⚠️ No telemetry in {TELEMETRY_DIR}")
+        return
+    if args.run:
+        path = Path(args.run)
+        if not path.exists():
+            path = TELEMETRY_DIR / f"{args.run.removesuffix('.jsonl')}.jsonl"
+    else:
+        path = runs[-1]
+    earlier = [p for p in runs if p.name < path.name]
+    print_report(path, earlier[-1] if earlier else None, args.top)
+
+
+if __name__ == "__main__":
+    main()
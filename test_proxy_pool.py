@@ -0,0 +1,129 @@
+# test_proxy_pool.py
+import time
+
+import requests
+
+import http_client
+import proxy_pool
+import resilience
+
+# Stand-in exits; nothing here connects to them
+EXITS = ["http://127.0.0.1:8781", "http://127.0.0.1:8782", "http://127.0.0.1:8783"]
+
+
+def pool(entries=EXITS):
+    proxy_pool.configure(entries)
+    return {e.name: e for e in proxy_pool.exits()}
+
+
+def choose_ok(url):
+    # One request through the pool that came back fine
+    exit = proxy_pool.choose(url)
+    proxy_pool.release(exit, url, 200, 0.1)
+    return exit
+
+
+def unreachable(exit, url):
+    proxy_pool.release(exit, url, error=requests.exceptions.ProxyError("refused"))
+
+
+def test_requests_spread_over_exits():
+    pool()
+    url = "http://spread.test/p"
+    used = {choose_ok(url).name for _ in range(30)}
+    assert len(used) > 1
+    assert proxy_pool.exit_count(url) == len(EXITS)
+
+
+def test_direct_hosts_skip_the_pool():
+    pool()
+    proxy_pool.declare("http://direct.test", use=False)
+    assert proxy_pool.choose("http://direct.test/p") is None
+    assert proxy_pool.exit_count("http://direct.test") == 1
+
+
+def test_bench_is_per_host():
+    exits = pool()
+    blocked = exits[EXITS[0]]
+    assert proxy_pool.bench(blocked, "http://bench.test/p")
+    assert all(choose_ok("http://bench.test/p") is not blocked for _ in range(20))
+    assert proxy_pool.stats()[blocked.name]["hosts"]["bench.test"]["benched"]
+    # Another host still goes out through it
+    assert any(choose_ok("http://other.test/p") is blocked for _ in range(30))
+
+
+def test_bench_reports_the_last_exit():
+    exits = pool(EXITS[:2])
+    url = "http://last.test/p"
+    assert proxy_pool.bench(exits[EXITS[0]], url)
+    assert not proxy_pool.bench(exits[EXITS[1]], url)
+
+
+def test_unreachable_exit_is_evicted():
+    exits = pool()
+    url = "http://evict.test/p"
+    dead = exits[EXITS[0]]
+    # With the others benched for this host, every request goes out through the dead one
+    for name in EXITS[1:]:
+        proxy_pool.bench(exits[name], url)
+    for _ in range(proxy_pool.EVICT_FAILURES):
+        unreachable(proxy_pool.choose(url), url)
+    assert dead.evictions == 1 and proxy_pool.stats()[dead.name]["evicted"]
+    # Eviction covers every host, not only the one that noticed
+    assert all(choose_ok("http://elsewhere.test/p") is not dead for _ in range(20))
+
+    # Back after the eviction, a single further failure is enough to evict it again
+    dead.evicted_until = time.monotonic() - 1
+    unreachable(proxy_pool.choose(url), url)
+    assert dead.evictions == 2
+
+
+def test_sticky_host_moves_when_benched():
+    pool()
+    proxy_pool.declare("http://sticky.test", sticky=True)
+    url = "http://sticky.test/p"
+    pinned = choose_ok(url)
+    assert all(choose_ok(url) is pinned for _ in range(10))
+    assert proxy_pool.exit_count(url) == 1
+    proxy_pool.bench(pinned, url)
+    moved = choose_ok(url)
+    assert moved is not pinned
+    assert all(choose_ok(url) is moved for _ in range(10))
+
+
+def test_block_through_a_proxy_frees_the_breaker_trial():
+    exits = pool()
+    url = "http://trial.test/p"
+    block = requests.Response()
+    block.status_code, block._content = 403, b"<title>Just a moment...</title>"
+    block.proxy_exit = exits[EXITS[0]]
+    ok = requests.Response()
+    ok.status_code, ok._content = 200, b"ok"
+    answers = [block, ok]
+
+    resilience._breakers.pop("trial.test", None)
+    breaker = resilience.breaker_for(url)
+    breaker.failure(blocked=True)
+    # The cooldown is over: the next request is the half-open trial
+    breaker.open_until = time.monotonic() - 1
+
+    real_get, real_backoff = http_client.get, resilience.BACKOFF_BASE
+    http_client.get, resilience.BACKOFF_BASE = lambda url, **kwargs: answers.pop(0), 0.0
+    try:
+        assert resilience.fetch(url, attempts=2).status_code == 200
+    finally:
+        http_client.get, resilience.BACKOFF_BASE = real_get, real_backoff
+    assert not breaker.snapshot()["open"] and not breaker.trial_running
+
+
+def teardown_module():
+    proxy_pool.configure([])
+    resilience._breakers.pop("trial.test", None)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
+    teardown_module()
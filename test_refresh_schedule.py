@@ -0,0 +1,140 @@
+# test_refresh_schedule.py
+from datetime import datetime, timedelta
+
+import fingerprints
+import refresh_schedule
+
+SPEC = {
+    "name": "test_gpu",
+    "stock_check": {"when": "title_contains", "terms": ["5090"], "page": "instock_label"},
+}
+
+
+def setup_module():
+    # Plans are made with a budget even where SCRAPER_REFRESH_BUDGET turns them off
+    global _budget
+    _budget = refresh_schedule.REQUEST_BUDGET
+    refresh_schedule.REQUEST_BUDGET = 100
+
+
+def teardown_module():
+    refresh_schedule.REQUEST_BUDGET = _budget
+    # no_history() replaced the archive; the next caller reads it again
+    refresh_schedule.reload_history()
+
+
+def no_history():
+    # Every product falls back to the minimum change rate, with nothing read from disk
+    refresh_schedule._history = {"products": {}, "vendors": {}}
+
+
+def card(n, name="RTX 5090", price="8000"):
+    return {"Product Name": f"{name} #{n}", "Price (AED)": price, "Product URL": f"http://shop.test/p{n}"}
+
+
+def index_with(*rows, hours_ago=1):
+    index = fingerprints.FingerprintIndex(SPEC["name"], enabled=False)
+    checked_at = (datetime.now() - timedelta(hours=hours_ago)).isoformat(timespec="seconds")
+    for row in rows:
+        index.previous[row["Product URL"]] = {
+            "hash": fingerprints.card_hash(row), "stock": "In Stock", "qty": "3", "checked_at": checked_at,
+        }
+    return index
+
+
+def on_floor(row):
+    return "5090" in row["Product Name"]
+
+
+def wants(plan, row, index):
+    return plan.wants(SPEC, row, index, on_floor(row))
+
+
+def test_due_products_are_checked():
+    no_history()
+    row = card(1)
+    plan = refresh_schedule.RefreshPlan({(SPEC["name"], row["Product URL"])}, reserve=0)
+    assert wants(plan, row, index_with(row))
+    assert plan.stats["due"] == 1
+
+
+def test_unchanged_cards_carry_forward():
+    no_history()
+    row = card(1)
+    plan = refresh_schedule.RefreshPlan(set(), reserve=5)
+    assert not wants(plan, row, index_with(dict(row)))
+    assert row["Stock Status"] == "In Stock"
+    assert plan.reserve == 5
+
+
+def test_age_cap_still_applies():
+    no_history()
+    row = card(1)
+    old = index_with(dict(row), hours_ago=fingerprints.MAX_AGE_HOURS + 1)
+    plan = refresh_schedule.RefreshPlan(set(), reserve=5)
+    assert wants(plan, row, old)
+    assert "Stock Status" not in row
+    assert plan.reserve == 4
+
+
+def test_cards_outside_the_spec_rule_get_no_reserve():
+    no_history()
+    plan = refresh_schedule.RefreshPlan(set(), reserve=5)
+    assert not wants(plan, card(1, name="RTX 4060"), index_with())
+    assert plan.reserve == 5 and plan.stats["not_checked"] == 1
+
+
+def test_reserve_runs_out():
+    no_history()
+    plan = refresh_schedule.RefreshPlan(set(), reserve=2)
+    index = index_with()
+    assert [wants(plan, card(n), index) for n in range(4)] == [True, True, False, False]
+    assert plan.stats["new_or_changed"] == 2 and plan.stats["over_budget"] == 2
+
+
+def test_low_value_cards_leave_half_the_reserve():
+    no_history()
+    cheap = refresh_schedule.priority(SPEC, "", "RTX 5090", 100.0, None, datetime.now())
+    plan = refresh_schedule.RefreshPlan(set(), reserve=4, cutoff=cheap * 2)
+    index = index_with()
+    assert [wants(plan, card(n, price="100"), index) for n in range(4)] == [True, True, False, False]
+    # Cards worth at least the cutoff still find the slots that were kept for them
+    assert [wants(plan, card(n, price="50000"), index) for n in range(4, 7)] == [True, True, False]
+
+
+def test_plan_stays_within_budget():
+    no_history()
+    products = refresh_schedule._history["products"]
+    for n in range(300):
+        products[("microless_gpu", f"http://shop.test/gpu{n}")] = {"name": f"RTX 5090 #{n}", "price": 8000.0}
+    plan = refresh_schedule.build_plan(["microless_gpu"], budget=100)
+    assert len(plan.due) == 75
+    assert len(plan.due) + plan.reserve == 100
+    assert plan.cutoff > 0
+
+
+def test_vendors_outside_a_run_get_their_own_plan():
+    no_history()
+    first = refresh_schedule.plan_for("microless_gpu")
+    first.reserve = 0
+    second = refresh_schedule.plan_for("microless_cpu_with_stock")
+    assert second is not first and second.reserve > 0
+
+
+def test_a_run_shares_one_plan():
+    no_history()
+    plan = refresh_schedule.start_run(["microless_gpu", "microless_cpu_with_stock"])
+    try:
+        assert refresh_schedule.plan_for("microless_gpu") is plan
+        assert refresh_schedule.plan_for("microless_cpu_with_stock") is plan
+    finally:
+        refresh_schedule.finish_run()
+
+
+if __name__ == "__main__":
+    setup_module()
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
+    teardown_module()
@@ -0,0 +1,179 @@
+# test_resilience.py
+import time
+
+import requests
+
+import http_client
+import resilience
+
+HOST = "breaker.test"
+URL = f"http://{HOST}/page"
+
+
+def response(status, body=b"ok"):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    res.url = URL
+    return res
+
+
+def cool_down(breaker):
+    # Skips the wait: the cooldown is over as far as the breaker can tell
+    breaker.open_until = time.monotonic() - 1
+
+
+def serve(*statuses, body=b"ok"):
+    # http_client.get stand-in answering with the given statuses in turn
+    answers = list(statuses)
+    calls = []
+
+    def get(url, **kwargs):
+        calls.append(url)
+        return response(answers.pop(0), body)
+    return get, calls
+
+
+def fetch_with(get, **kwargs):
+    real_get, real_backoff = http_client.get, resilience.BACKOFF_BASE
+    http_client.get, resilience.BACKOFF_BASE = get, 0.0
+    try:
+        return resilience.fetch(URL, **kwargs)
+    finally:
+        http_client.get, resilience.BACKOFF_BASE = real_get, real_backoff
+
+
+def fresh_breaker():
+    resilience._breakers.pop(HOST, None)
+    return resilience.breaker_for(URL)
+
+
+def test_opens_after_failures_in_a_row():
+    breaker = resilience.CircuitBreaker(HOST)
+    for _ in range(resilience.BREAKER_FAILURES - 1):
+        breaker.before()
+        breaker.failure()
+    breaker.before()
+    breaker.failure()
+    assert breaker.snapshot()["open"]
+    try:
+        breaker.before()
+        assert False, "an open breaker let a request through"
+    except resilience.CircuitOpenError:
+        pass
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_success_resets_the_count():
+    breaker = resilience.CircuitBreaker(HOST)
+    for _ in range(resilience.BREAKER_FAILURES - 1):
+        breaker.failure()
+    breaker.success()
+    breaker.failure()
+    assert not breaker.snapshot()["open"]
+
+
+def test_block_page_opens_at_once():
+    breaker = resilience.CircuitBreaker(HOST)
+    breaker.failure(blocked=True)
+    assert breaker.snapshot()["open"] and breaker.snapshot()["blocked"] == 1
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = resilience.CircuitBreaker(HOST)
+    breaker.failure(blocked=True)
+    cool_down(breaker)
+    breaker.before()
+    try:
+        breaker.before()
+        assert False, "a second request ran alongside the trial"
+    except resilience.CircuitOpenError:
+        pass
+
+
+def test_trial_success_closes():
+    breaker = resilience.CircuitBreaker(HOST)
+    breaker.failure(blocked=True)
+    cool_down(breaker)
+    breaker.before()
+    breaker.success()
+    assert not breaker.snapshot()["open"]
+    breaker.before()
+    breaker.before()
+
+
+def test_trial_failure_reopens():
+    breaker = resilience.CircuitBreaker(HOST)
+    breaker.failure(blocked=True)
+    cool_down(breaker)
+    breaker.before()
+    breaker.failure()
+    assert breaker.snapshot()["open"] and breaker.snapshot()["opened"] == 2
+
+
+def test_abandoned_trial_frees_the_slot():
+    breaker = resilience.CircuitBreaker(HOST)
+    breaker.failure(blocked=True)
+    cool_down(breaker)
+    breaker.before()
+    breaker.abandon()
+    breaker.before()
+
+
+def test_fetch_retries_then_succeeds():
+    breaker = fresh_breaker()
+    get, calls = serve(503, 502, 200)
+    assert fetch_with(get, attempts=3).status_code == 200
+    assert len(calls) == 3
+    assert breaker.failures == 0
+
+
+def test_fetch_gives_up_after_attempts():
+    fresh_breaker()
+    get, calls = serve(503, 503)
+    try:
+        fetch_with(get, attempts=2)
+        assert False, "fetch returned after every attempt failed"
+    except resilience.FetchError:
+        pass
+    assert len(calls) == 2
+
+
+def test_fetch_keeps_404():
+    fresh_breaker()
+    get, _ = serve(404)
+    assert fetch_with(get).status_code == 404
+
+
+def test_fetch_stops_on_block_page():
+    breaker = fresh_breaker()
+    get, calls = serve(403, 200, body=b"<title>Just a moment...</title>")
+    try:
+        fetch_with(get, attempts=2)
+        assert False, "a block page was retried"
+    except resilience.BlockedError:
+        pass
+    assert len(calls) == 1
+    assert breaker.snapshot()["open"]
+
+
+def test_429_does_not_trip_the_breaker():
+    breaker = fresh_breaker()
+    get, _ = serve(*[429] * resilience.BREAKER_FAILURES)
+    try:
+        fetch_with(get, attempts=resilience.BREAKER_FAILURES)
+    except resilience.FetchError:
+        pass
+    assert not breaker.snapshot()["open"]
+
+
+def teardown_module():
+    resilience._breakers.pop(HOST, None)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
+    teardown_module()
@@ -1,47 +1,224 @@
-from playwright.sync_api import sync_playwright
+import os
 import json
+import argparse
+import threading
+from datetime import date, datetime, timezone
+from functools import partial
 
-def scrape_tiktok_mobile(hashtag="gaminguae", max_scrolls=5):
-    results = []
+import browser_pool
+import deadlines
+
+# Grid cards on a tag page; scrolling stops once no new ones render
+ITEM_SELECTOR = '[data-e2e="challenge-item"]'
+KEYWORDS = ["#", "setup", "gaming", "uae", "valorant", "pc", "build"]
+
+# Web API calls that carry the feed as JSON while the page scrolls
+ITEM_LIST_PATHS = ["/api/challenge/item_list", "/api/recommend/item_list"]
+
+# Give up on a page after this many scrolls even if new items keep coming
+MAX_SCROLLS = 50
+
+# Seconds one hashtag may take in all; scrolling stops with what was captured so far
+HASHTAG_SECONDS = float(os.environ.get("SCRAPER_HASHTAG_DEADLINE", "300"))
+
+# Grab all visible text blocks (more robust than fixed divs) in one round trip
+TEXT_BLOCKS_JS = "() => Array.from(document.querySelectorAll('div, span, strong'), el => el.innerText || '')"
+
+
+def mobile_pool(workers=browser_pool.BROWSER_WORKERS):
+    return browser_pool.BrowserPool(workers, engine="webkit", device="iPhone 13 Pro")
+
+
+def _scroll_tag_page(page, hashtag, max_scrolls):
     url = f"https://www.tiktok.com/tag/{hashtag}"
+    print(f"🌐 Visiting: {url}")
+    page.goto(url, wait_until="domcontentloaded")
+    try:
+        page.wait_for_selector(ITEM_SELECTOR, timeout=20000)
+    except browser_pool.PlaywrightTimeout:
+        print(f"⚠️ No posts rendered for #{hashtag}")
+        return []
+
+    for _ in range(max_scrolls):
+        count = page.locator(ITEM_SELECTOR).count()
+        page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+        if not browser_pool.wait_for_more(page, ITEM_SELECTOR, count, 8000):
+            break
+
+    results = []
+    for text in page.evaluate(TEXT_BLOCKS_JS):
+        text = text.strip()
+        if len(text) > 20 and any(word in text.lower() for word in KEYWORDS):
+            results.append({"caption": text})
+    return results
+
+
+def _is_item_list(response):
+    return any(path in response.url for path in ITEM_LIST_PATHS)
+
+
+def post_from_item(item, hashtag):
+    author = (item.get("author") or {}).get("uniqueId", "")
+    stats = item.get("stats") or {}
+    created = item.get("createTime")
+    return {
+        "id": str(item["id"]),
+        "hashtag": hashtag,
+        "author": author,
+        "caption": item.get("desc", ""),
+        "created": datetime.fromtimestamp(int(created), timezone.utc).isoformat() if created else "",
+        "plays": stats.get("playCount", 0),
+        "likes": stats.get("diggCount", 0),
+        "comments": stats.get("commentCount", 0),
+        "shares": stats.get("shareCount", 0),
+        "url": f"https://www.tiktok.com/@{author}/video/{item['id']}",
+    }
+
+
+class JsonlSink:
+    # Appends one JSON object per line as posts arrive and keeps the ids already written,
+    # so a post seen under several hashtags, or again in a rerun the same day, is written once
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.seen = set()
+        ends_cleanly = True
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    ends_cleanly = line.endswith("\n")
+                    try:
+                        self.seen.add(json.loads(line)["id"])
+                    except (ValueError, KeyError, TypeError):
+                        # A line cut short when an earlier run was killed mid-write
+                        continue
+        self.file = open(path, "a", encoding="utf-8")
+        if not ends_cleanly:
+            self.file.write("\n")
+        if self.seen:
+            print(f"📄 {path}: {len(self.seen)} posts already saved, only new ones are added")
 
-    with sync_playwright() as p:
-        iphone = p.devices['iPhone 13 Pro']
-        browser = p.webkit.launch(headless=False)
-        context = browser.new_context(**iphone)
-        page = context.new_page()
-
-        print(f"🌐 Visiting: {url}")
-        page.goto(url, timeout=60000)
-        page.wait_for_timeout(6000)
-
-        for _ in range(max_scrolls):
-            page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
-            page.wait_for_timeout(3000)
-
-        # Grab all visible text blocks (more robust than fixed divs)
-        all_blocks = page.query_selector_all("div, span, strong")
-
-        for block in all_blocks:
-            try:
-                text = block.inner_text().strip()
-                if (
-                    len(text) > 20 and             # meaningful content
-                    any(word in text.lower() for word in ["#", "setup", "gaming", "uae", "valorant", "pc", "build"])
-                ):
-                    results.append({"caption": text})
-            except Exception:
+    def add(self, post):
+        with self.lock:
+            if post["id"] in self.seen:
+                return False
+            self.seen.add(post["id"])
+            self.file.write(json.dumps(post, ensure_ascii=False) + "\n")
+            self.file.flush()
+            return True
+
+    def close(self):
+        self.file.close()
+
+
+def _absorb(responses, hashtag, sink, captured):
+    # Returns (ids not yet in this hashtag's capture, new posts written, whether the API
+    # reported more) for the responses so far. `captured` holds the ids this hashtag has
+    # seen; the sink also skips posts written earlier today or by other hashtags.
+    new_ids, written, has_more = 0, 0, False
+    while responses:
+        response = responses.pop(0)
+        try:
+            data = response.json()
+        except Exception as e:
+            print(f"⚠️ Unreadable item list for #{hashtag}: {e}")
+            continue
+        has_more = has_more or bool(data.get("hasMore"))
+        for item in data.get("itemList") or []:
+            if "id" not in item:
                 continue
+            if str(item["id"]) not in captured:
+                captured.add(str(item["id"]))
+                new_ids += 1
+            if sink.add(post_from_item(item, hashtag)):
+                written += 1
+    return new_ids, written, has_more
 
-        browser.close()
 
-    return results
+def _capture_tag_feed(page, hashtag, sink, max_scrolls=MAX_SCROLLS, wait_ms=10000):
+    # Reads posts from the item-list JSON the page fetches while scrolling and stops
+    # once a scroll brings no ids new to this hashtag or the API says there is nothing more.
+    # Responses are only collected in the event handler and parsed afterwards.
+    responses = []
+    page.on("response", lambda response: responses.append(response) if _is_item_list(response) else None)
+
+    deadline = deadlines.Deadline(HASHTAG_SECONDS, label="hashtag")
+    url = f"https://www.tiktok.com/tag/{hashtag}"
+    print(f"🌐 Visiting: {url}")
+    page.goto(url, wait_until="domcontentloaded")
+    try:
+        page.wait_for_selector(ITEM_SELECTOR, timeout=20000)
+    except browser_pool.PlaywrightTimeout:
+        print(f"⚠️ No posts rendered for #{hashtag}")
+        return 0
+
+    # The first screen is often rendered server-side, so only scrolls can end the feed
+    captured = set()
+    written = _absorb(responses, hashtag, sink, captured)[1]
+    for _ in range(max_scrolls):
+        if deadline.expired():
+            print(f"⏱ #{hashtag}: hashtag deadline reached, keeping what was captured")
+            break
+        try:
+            with page.expect_response(_is_item_list, timeout=min(wait_ms, deadline.remaining() * 1000)):
+                page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+        except browser_pool.PlaywrightTimeout:
+            break
+
+        new_ids, new_posts, has_more = _absorb(responses, hashtag, sink, captured)
+        written += new_posts
+        if not new_ids or not has_more:
+            break
+
+    print(f"✅ #{hashtag}: {written} new posts")
+    return written
 
-if __name__ == "__main__":
-    hashtag = "gaminguae"
-    posts = scrape_tiktok_mobile(hashtag)
 
-    with open(f"tiktok_{hashtag}_mobile_filtered.json", "w", encoding="utf-8") as f:
-        json.dump(posts, f, ensure_ascii=False, indent=2)
+def capture_hashtags(hashtags, out_path, max_scrolls=MAX_SCROLLS, workers=browser_pool.BROWSER_WORKERS):
+    # Hashtags run in parallel pages; every post lands in out_path as soon as it is seen
+    sink = JsonlSink(out_path)
+    try:
+        with mobile_pool(min(workers, len(hashtags))) as pool:
+            counts = pool.map(partial(_capture_tag_feed, sink=sink, max_scrolls=max_scrolls), hashtags)
+    finally:
+        sink.close()
+    return dict(zip(hashtags, counts))
 
-    print(f"✅ Scraped and filtered {len(posts)} posts from #{hashtag}")
+
+def scrape_tiktok_mobile(hashtag="gaminguae", max_scrolls=5, pool=None):
+    job = partial(_scroll_tag_page, max_scrolls=max_scrolls)
+    if pool is not None:
+        return pool.submit(job, hashtag).result()
+    with mobile_pool(1) as pool:
+        return pool.submit(job, hashtag).result()
+
+
+def scrape_hashtags(hashtags, max_scrolls=5, workers=browser_pool.BROWSER_WORKERS):
+    # One warm browser per worker; hashtags are spread across them in parallel
+    with mobile_pool(min(workers, len(hashtags))) as pool:
+        results = pool.map(partial(_scroll_tag_page, max_scrolls=max_scrolls), hashtags)
+    return dict(zip(hashtags, results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect TikTok posts for hashtags")
+    parser.add_argument("hashtags", nargs="*", default=["gaminguae"])
+    parser.add_argument("--out", help="JSON Lines file for captured posts (default: tiktok_posts_<date>.jsonl)")
+    parser.add_argument("--max-scrolls", type=int, default=MAX_SCROLLS)
+    parser.add_argument("--dom", action="store_true", help="old mode: filter visible text blocks into one JSON file per hashtag")
+    args = parser.parse_args()
+
+    if args.dom:
+        for hashtag, posts in scrape_hashtags(args.hashtags, min(args.max_scrolls, 5)).items():
+            with open(f"tiktok_{hashtag}_mobile_filtered.json", "w", encoding="utf-8") as f:
+                json.dump(posts, f, ensure_ascii=False, indent=2)
+            print(f"✅ Scraped and filtered {len(posts)} posts from #{hashtag}")
+        return
+
+    out_path = args.out or f"tiktok_posts_{date.today().isoformat()}.jsonl"
+    counts = capture_hashtags(args.hashtags, out_path, args.max_scrolls)
+    print(f"✅ Wrote {sum(counts.values())} posts from {len(counts)} hashtags to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
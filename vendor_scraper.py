@@ -1,13 +1,29 @@
 import os
+import argparse
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
 from pathlib import Path
 import importlib
 
+import deadlines
+import http_client
+import parse_pool
+import proxy_pool
+import rate_control
+import refresh_schedule
+import resilience
+import response_archive
+import scrape_engine
+import telemetry
+from vendor_specs import SPECS
+
 # Directory where CSV files will be saved
 EXPORT_DIR = Path("exports")
 EXPORT_DIR.mkdir(exist_ok=True)
 
-# List of vendor modules to run
+# Vendors to run: names from vendor_specs.SPECS or modules exposing scrape(export_dir)
 vendor_modules = [
     "microless_cpu_with_stock",
     "gccgamers_cases",
@@ -18,24 +34,166 @@ vendor_modules = [
     "microless_Cases",
     "laifai_gpu",
     "dxbgamers_cpu",
+    "citycenter_cpu",
 ]
 
-def run_all_scrapers():
-    print(f"📦 Starting vendor scraping: {date.today().isoformat()}")
-    for module_name in vendor_modules:
+# How many vendor jobs may hit the same host at once
+MAX_JOBS_PER_HOST = int(os.environ.get("SCRAPER_MAX_JOBS_PER_HOST", "1"))
+
+_host_locks = {}
+_host_locks_guard = threading.Lock()
+
+
+def _host_semaphore(host):
+    with _host_locks_guard:
+        if host not in _host_locks:
+            _host_locks[host] = threading.BoundedSemaphore(MAX_JOBS_PER_HOST)
+        return _host_locks[host]
+
+
+def vendor_host(module_name):
+    # Vendors sharing a host share its concurrency cap
+    if module_name in SPECS:
+        return http_client.host_of(SPECS[module_name]["base_url"])
+    return module_name
+
+
+def run_scraper(module_name, export_dir=EXPORT_DIR, replay=None):
+    host = vendor_host(module_name)
+    result = {"module": module_name, "host": host, "ok": False, "partial": False, "seconds": 0.0, "error": "", "rows": 0}
+
+    with _host_semaphore(host), telemetry.context(vendor=module_name):
+        start = time.perf_counter()
+        # The vendor's clock starts once it holds its host, not while it queues for it
+        deadline = deadlines.for_vendor()
+        failed = []
         try:
             print(f"\n▶ Running {module_name}.scrape()")
-            scraper = importlib.import_module(module_name)
+            if module_name in SPECS:
+                result["rows"] = scrape_engine.scrape_vendor(
+                    module_name, export_dir, replay=replay, deadline=deadline, failed=failed
+                )
+            else:
+                scraper = importlib.import_module(module_name)
 
-            if not hasattr(scraper, "scrape"):
-                raise AttributeError("Module has no 'scrape' function")
+                if not hasattr(scraper, "scrape"):
+                    raise AttributeError("Module has no 'scrape' function")
 
-            scraper.scrape(EXPORT_DIR)
+                if replay:
+                    rows = scraper.scrape(export_dir, replay=replay)
+                else:
+                    rows = scraper.scrape(export_dir)
+                result["rows"] = rows if isinstance(rows, int) else 0
+            # The output is kept, but a run missing whole listing pages did not succeed
+            if failed:
+                result["error"] = f"{len(failed)} listing pages failed or were skipped"
+            result["ok"] = not failed
+            # Only a complete run resets the category's refresh clock; a partial one stays due
+            if not (replay or failed or deadline.skipped):
+                refresh_schedule.vendor_done(module_name)
 
         except Exception as e:
+            result["error"] = str(e)
             print(f"❌ Failed to run {module_name}: {e}")
 
-    print(f"\n✅ Done. All outputs saved to: {EXPORT_DIR.resolve()}")
+        finally:
+            result["seconds"] = time.perf_counter() - start
+            result["partial"] = deadline.skipped > 0 or bool(failed)
+            telemetry.emit(
+                "vendor", seconds=round(result["seconds"], 3), ok=result["ok"], rows=result["rows"],
+                partial=result["partial"], error=result["error"],
+            )
+
+    return result
+
+
+def print_summary(results, wall_seconds):
+    print("\n⏱ Per-vendor summary:")
+    for r in sorted(results, key=lambda r: r["seconds"], reverse=True):
+        status = ("⏱" if r["partial"] else "✅") if r["ok"] else "❌"
+        print(f"  {status} {r['module']:<26} {r['host']:<20} {r['seconds']:8.1f}s {r['error']}")
+
+    total = sum(r["seconds"] for r in results)
+    print(f"  Wall time: {wall_seconds:.1f}s (sequential would be ~{total:.1f}s)")
+
+
+def due_modules(modules):
+    # Categories whose listings have barely moved since their last run wait for a later one
+    due = []
+    for name in modules:
+        is_due, reason = refresh_schedule.vendor_due(name)
+        if is_due:
+            due.append(name)
+        else:
+            print(f"⏭️ Skipping {name}: {reason}")
+    return due
+
+
+def run_all_scrapers(modules=None, export_dir=EXPORT_DIR, replay=None, force=False):
+    modules = modules or vendor_modules
+    if replay:
+        response_archive.start_replay(replay)
+    print(f"📦 Starting vendor scraping: {replay or date.today().isoformat()}")
+    if not (replay or force):
+        modules = due_modules(modules)
+    if not modules:
+        print("✅ Nothing is due for a refresh.")
+        return []
+
+    start = time.perf_counter()
+    results = run_batch(modules, export_dir, replay)
+    parse_pool.shutdown()
+
+    print_summary(results, time.perf_counter() - start)
+    http_client.print_stats()
+    rate_control.print_stats()
+    resilience.print_stats()
+    proxy_pool.print_stats()
+    print(f"\n✅ Done. All outputs saved to: {Path(export_dir).resolve()}")
+    return results
+
+
+def run_batch(modules, export_dir=EXPORT_DIR, replay=None, on_result=None):
+    # Runs the vendors in parallel as one telemetry run and one refresh budget;
+    # on_result(result) is called as each vendor finishes
+    if not replay:
+        refresh_schedule.start_run(modules)
+    telemetry.start_run(vendors=modules, replay=replay)
+    deadlines.start_run()
+
+    results = []
+    with ThreadPoolExecutor(max_workers=len(modules)) as pool:
+        futures = [pool.submit(run_scraper, name, export_dir, replay) for name in modules]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if on_result:
+                on_result(results[-1])
+
+    deadlines.finish_run()
+    refresh_schedule.finish_run()
+    telemetry_path = telemetry.finish_run(failed=[r["module"] for r in results if not r["ok"]])
+    if telemetry_path:
+        print(f"\n🧾 Telemetry saved to {telemetry_path} (python telemetry.py report)")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the vendor scrapers")
+    parser.add_argument("vendors", nargs="*", help="vendors to run (default: all)")
+    parser.add_argument("--archive", action="store_true", help="write raw responses to the compressed archive")
+    parser.add_argument("--replay", metavar="YYYY-MM-DD", help="re-parse an archived day without network access")
+    parser.add_argument("--force", action="store_true", help="scrape every vendor, even those not due for a refresh")
+    parser.add_argument("--daemon", action="store_true", help="stay resident and scrape each vendor on its interval")
+    args = parser.parse_args()
+
+    if args.archive:
+        response_archive.enable()
+    if args.daemon:
+        import scrape_daemon
+        scrape_daemon.run_daemon(args.vendors or None)
+        return
+    # Vendors named on the command line always run
+    run_all_scrapers(args.vendors or None, replay=args.replay, force=args.force or bool(args.vendors))
+
 
 if __name__ == "__main__":
-    run_all_scrapers()
+    main()
@@ -0,0 +1,259 @@
+# Declarative vendor definitions driven by scrape_engine.
+#
+# Field rules (applied to each listing container, in "columns" order):
+#   "select"   CSS selector, or a list tried in order until one matches
+#   "attr"     read this attribute instead of the text
+#   "remove"   substrings stripped from the value before the final strip()
+#   "default"  value when nothing matches
+#   "fallback" copy another column when nothing matches
+#   "required" skip the product when nothing matches
+#   "absolute" prefix base_url onto relative links
+#   "number"   keep only values that parse as a number, else ""
+#   "present"/"absent"  fixed values depending on whether the selector matches
+#   "value"    constant value; "today" gives today's ISO date
+#
+# "store_api" lists a WooCommerce vendor from its Store API JSON instead of the rendered
+# pages (store_api.py); "fields" maps each column to a product value such as "price" or
+# "stock". The HTML fields stay as the fallback for shops that disable the endpoint.
+#
+# "page_size" names the query parameter a Magento listing takes its page size from; the
+# largest size the category's toolbar offers is used.
+#
+# "proxy" sets how the vendor uses the proxy pool (proxy_pool.py): "sticky" sends every
+# request through one exit, for sessions tied to an address; "use": False stays direct.
+#
+# "refresh" tunes refresh_schedule: "weight" scales how volatile the category is treated
+# as, "focus" lists title terms whose products get their stock checked more often, and
+# "interval_hours" is how often scrape_daemon scrapes the vendor
+
+GCCGAMERS_FIELDS = {
+    "Date": {"value": "today"},
+    "Product Name": {"select": "h2.product.name.product-name a", "required": True},
+    "Model": {"value": ""},
+    "Price (AED)": {"select": "span.price-wrapper span.price", "remove": ["AED", ","], "number": True},
+    "Original Price (AED)": {"select": "span.old-price span.price", "remove": ["AED"], "default": ""},
+    "Discount": {"select": "span.labelsale", "default": ""},
+    "Stock Status": {"select": "div.stock.unavailable span", "present": "Out of Stock", "absent": "In Stock"},
+    "Available Qty": {"value": ""},
+    "Product URL": {"select": "h2.product.name.product-name a", "attr": "href", "required": True},
+}
+
+GCCGAMERS_COLUMNS = [
+    "Date", "Product Name", "Model", "Price (AED)", "Original Price (AED)",
+    "Discount", "Stock Status", "Product URL",
+]
+
+GCCGAMERS = {
+    "base_url": "https://gccgamers.com",
+    "platform": "magento",
+    "page_template": "{category}?p={page}",
+    "page_size": {"param": "product_list_limit"},
+    "container": "div.product-item-info",
+    "container_class": "product-item-info",
+    "rotate_user_agent": True,
+    "rate": {"max_rps": 4, "max_concurrency": 4},
+    "fields": GCCGAMERS_FIELDS,
+    "columns": GCCGAMERS_COLUMNS,
+}
+
+MICROLESS_LISTING = {
+    "base_url": "https://uae.microless.com",
+    "platform": "microless",
+    "page_template": "{category}l/?sort=popularity&page={page}",
+    "container": "div.product.product-carousel.grid-list",
+    "container_class": "product-carousel",
+    "rate": {"max_rps": 3, "max_concurrency": 3},
+}
+
+MICROLESS_FIELDS = {
+    "Date": {"value": "today"},
+    "Product Name": {"select": "div.product-title a", "required": True},
+    "Price (AED)": {"select": "div.product-price .new-price .price-amount", "remove": [","], "default": "0"},
+    "Discount": {"select": "div.product-discount-badge", "default": ""},
+    "Stock Status": {"value": ""},
+    "Available Qty": {"value": ""},
+    "Product URL": {"select": "div.product-title a", "attr": "href", "absolute": True, "required": True},
+}
+
+MICROLESS_COLUMNS = [
+    "Date", "Product Name", "Price (AED)", "Discount", "Stock Status", "Available Qty", "Product URL",
+]
+
+WOOCOMMERCE_COLUMNS = [
+    "Date", "Product Name", "Base Price (AED)", "Final Price (AED)",
+    "Discount", "Stock Status", "Available Qty", "Product URL",
+]
+
+WOOCOMMERCE_API_FIELDS = {
+    "Date": "today",
+    "Product Name": "name",
+    "Base Price (AED)": "regular_price",
+    "Final Price (AED)": "price",
+    "Discount": "discount",
+    "Stock Status": "stock",
+    "Available Qty": "quantity",
+    "Product URL": "permalink",
+}
+
+SPECS = {
+    "gccgamers_gpu": {
+        **GCCGAMERS,
+        "category_path": "/computer-parts-compnents/graphic-cards.html",
+        "refresh": {"weight": 2.0, "interval_hours": 3},
+        "label": "GPU",
+    },
+    "gccgamers_cases": {
+        **GCCGAMERS,
+        "category_path": "/computer-parts-compnents/cases.html",
+        "columns": GCCGAMERS_COLUMNS[:7] + ["Available Qty"] + GCCGAMERS_COLUMNS[7:],
+        "refresh": {"focus": ["HYTE"]},
+        "label": "case",
+    },
+    "gccgamers_coolers": {
+        **GCCGAMERS,
+        "category_path": "/computer-parts-compnents/cpu-fan-cooler.html",
+        "label": "CPU cooler",
+    },
+    "microless_cpu_with_stock": {
+        **MICROLESS_LISTING,
+        "category_path": "/cpus/",
+        "fields": MICROLESS_FIELDS,
+        "columns": MICROLESS_COLUMNS,
+        "stock_check": {"when": "price_above", "price_field": "Price (AED)", "page": "instock_label", "retries": 3},
+        "label": "CPU",
+    },
+    "microless_gpu": {
+        **MICROLESS_LISTING,
+        "category_path": "/graphic_cards/",
+        "rotate_user_agent": True,
+        "fields": MICROLESS_FIELDS,
+        "columns": MICROLESS_COLUMNS,
+        # Only check stock for RTX 5090 or 5080
+        "stock_check": {"when": "title_contains", "terms": ["5090", "5080"], "page": "instock_label", "retries": 1},
+        "refresh": {"weight": 2.0, "interval_hours": 3},
+        "label": "GPU",
+    },
+    "microless_Cases": {
+        **MICROLESS_LISTING,
+        "category_path": "/computer_cases/",
+        "export_name": "microless_cases",
+        "fields": {
+            "Date": {"value": "today"},
+            "Product Name": {"select": ".product-title a", "required": True},
+            "Base Price (AED)": {"select": "div.old-price", "remove": ["AED", ","], "fallback": "Final Price (AED)"},
+            "Final Price (AED)": {"select": "div.new-price span.price-amount", "remove": ["AED", ","], "default": "0"},
+            "Discount": {"select": "div.product-discount-badge", "remove": ["% OFF"], "default": ""},
+            "Stock Status": {"value": ""},
+            "Available Qty": {"value": ""},
+            "Product URL": {"select": ".product-title a", "attr": "href", "absolute": True, "required": True},
+        },
+        "columns": WOOCOMMERCE_COLUMNS,
+        "stock_check": {"when": "price_above", "price_field": "Final Price (AED)", "page": "out_of_stock_badge", "retries": 1},
+        "refresh": {"focus": ["HYTE"]},
+        "label": "case",
+    },
+    "laifai_cpu": {
+        "base_url": "https://laifai.ae",
+        "category_path": "/product-category/cpu/",
+        "platform": "woocommerce",
+        "page_template": "{category}page/{page}/",
+        "container": "div.product-outer",
+        "container_class": "product-outer",
+        "rate": {"max_rps": 2, "max_concurrency": 2},
+        "fields": {
+            "Product Name": {"select": "h2.woocommerce-loop-product__title", "default": "Not found"},
+            "Price (AED)": {"select": "span.price bdi", "remove": ["AED"], "default": "Not found"},
+            "SKU": {"select": "div.product-sku", "remove": ["SKU:"], "default": ""},
+            "Product URL": {"select": "a.woocommerce-LoopProduct-link", "attr": "href", "default": ""},
+        },
+        "columns": ["Product Name", "Price (AED)", "SKU", "Product URL"],
+        "store_api": {"fields": {"Product Name": "name", "Price (AED)": "price", "SKU": "sku", "Product URL": "permalink"}},
+        "label": "CPU",
+    },
+    "laifai_gpu": {
+        "base_url": "https://laifai.ae",
+        "category_path": "/product-category/vga-card/",
+        "platform": "woocommerce",
+        "page_template": "{category}page/{page}/",
+        "container": "div.product-outer",
+        "container_class": "product-outer",
+        "listing_retries": 3,
+        "rate": {"max_rps": 2, "max_concurrency": 2},
+        "fields": {
+            "Date": {"value": "today"},
+            "Product Name": {"select": "h2.woocommerce-loop-product__title", "default": "Unknown"},
+            "Base Price (AED)": {"select": "span.price bdi", "remove": ["AED", ","], "default": "0"},
+            "Final Price (AED)": {"select": "span.price bdi", "remove": ["AED", ","], "default": "0"},
+            "Discount": {"value": ""},
+            "Stock Status": {"value": "In stock"},
+            "Available Qty": {"value": ""},
+            "Product URL": {"select": "a.woocommerce-LoopProduct-link", "attr": "href", "default": ""},
+        },
+        "columns": WOOCOMMERCE_COLUMNS,
+        "store_api": {"fields": WOOCOMMERCE_API_FIELDS},
+        "refresh": {"weight": 2.0, "interval_hours": 3},
+        "label": "GPU",
+    },
+    "dxbgamers_cpu": {
+        "base_url": "https://dxbgamers.com",
+        "category_path": "/product-category/hardware-components/processors/",
+        "platform": "woocommerce",
+        "page_template": "{category}page/{page}/",
+        "container": "div.product-wrapper",
+        "container_class": "product-wrapper",
+        "rate": {"max_rps": 2, "max_concurrency": 2},
+        "fields": {
+            "Date": {"value": "today"},
+            "Product Name": {"select": "h3.wd-entities-title a", "required": True},
+            "Base Price (AED)": {"select": "del .woocommerce-Price-amount", "remove": ["AED", ","], "fallback": "Final Price (AED)"},
+            "Final Price (AED)": {
+                "select": ["ins .woocommerce-Price-amount", "span.price > span.woocommerce-Price-amount"],
+                "remove": ["AED", ","],
+                "default": "0",
+            },
+            "Discount": {"select": "span.onsale.product-label", "default": ""},
+            "Stock Status": {"select": "p.wd-product-stock", "default": "Unknown"},
+            "Available Qty": {"value": ""},
+            "Product URL": {"select": "h3.wd-entities-title a", "attr": "href", "required": True},
+        },
+        "columns": WOOCOMMERCE_COLUMNS,
+        "store_api": {"fields": WOOCOMMERCE_API_FIELDS},
+        "label": "CPU",
+    },
+    # CityCenter sits behind a browser challenge. Its brainyfilter ajaxfilter endpoint
+    # returns the listing HTML inside JSON ("json_field"), and requests need the stored
+    # browser cookies plus matching headers. "session" names the cookies file and the
+    # page a browser loads to renew them when they are rejected; the clearance cookies
+    # only hold for one address, hence the sticky proxy.
+    "citycenter_cpu": {
+        "base_url": "https://citycenter.jo",
+        "category_path": "/index.php?route=module/brainyfilter/ajaxfilter&count=1&price=1&path=18_64",
+        "platform": "opencart",
+        "page_template": "{category}&page={page}",
+        "container": "div.caption",
+        "container_class": "caption",
+        "json_field": "result",
+        "headers": {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": "https://citycenter.jo/computer-hardware/components-cpu-and-processor",
+        },
+        "session": {
+            "cookies_file": "citycenter_cookies.json",
+            "browser_url": "https://citycenter.jo/computer-hardware/components-cpu-and-processor",
+            "ready_selector": "div.caption",
+        },
+        "rate": {"max_rps": 2, "max_concurrency": 2},
+        "proxy": {"sticky": True},
+        "fields": {
+            "Date": {"value": "today"},
+            "Product Name": {"select": "h4 a", "required": True},
+            "Price (JOD)": {"select": [".price-new", ".price-regular"], "remove": ["JOD", ","], "default": "N/A"},
+            "Original Price (JOD)": {"select": ".price-old", "remove": ["JOD", ","], "default": ""},
+            "Product URL": {"select": "h4 a", "attr": "href", "absolute": True, "required": True},
+        },
+        "columns": ["Date", "Product Name", "Price (JOD)", "Original Price (JOD)", "Product URL"],
+        "label": "CPU",
+    },
+}